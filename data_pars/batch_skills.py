@@ -0,0 +1,102 @@
+import os
+import sqlite3 as sql
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from db import DB_FILE, CSVtoSQLiteImporter
+from parser_class import VacancyParser
+from response_cache import CACHE_FILE
+from skill_matcher import SkillMatcher
+
+# Матчер рабочего процесса, создается один раз в инициализаторе пула
+_worker_matcher = None
+
+
+def strip_html(html: str) -> str:
+    """Удаление HTML-разметки из описания вакансии"""
+    if not html:
+        return ''
+    return BeautifulSoup(html, 'html.parser').get_text(' ')
+
+
+def _init_worker(tech_keywords: Dict[str, List[str]]) -> None:
+    """Построение матчера в рабочем процессе"""
+    global _worker_matcher
+    _worker_matcher = SkillMatcher(tech_keywords)
+
+
+def _extract_chunk(descriptions: List[str]) -> List[List[str]]:
+    """Извлечение технологий для пачки описаний в рабочем процессе"""
+    return [_worker_matcher.extract(strip_html(text)) for text in descriptions]
+
+
+def extract_skills_batch(descriptions: List[str], tech_keywords: Dict[str, List[str]],
+                         workers: Optional[int] = None, chunk_size: int = 500) -> List[List[str]]:
+    """
+    Пакетное извлечение технологий из описаний вакансий в пуле процессов
+    :param descriptions: Список описаний (HTML или текст)
+    :param tech_keywords: Словарь технология -> список синонимов
+    :param workers: Количество процессов (None - по числу ядер)
+    :param chunk_size: Размер пачки описаний для одного задания
+    :return: Списки технологий в порядке описаний
+    """
+    chunks = [descriptions[i:i + chunk_size] for i in range(0, len(descriptions), chunk_size)]
+    if workers == 1:
+        _init_worker(tech_keywords)
+        return [skills for chunk in chunks for skills in _extract_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(tech_keywords,)) as executor:
+        return [skills for result in executor.map(_extract_chunk, chunks) for skills in result]
+
+
+def load_stored_descriptions(cache_file: str = CACHE_FILE) -> Dict[str, str]:
+    """
+    Описания вакансий, сохраненные в кэше ответов API
+    :param cache_file: Путь к файлу кэша
+    :return: Словарь ссылка на вакансию -> описание
+    """
+    if not os.path.exists(cache_file):
+        return {}
+    with sql.connect(cache_file) as conn:
+        rows = conn.execute(
+            "SELECT json_extract(body, '$.alternate_url'), json_extract(body, '$.description') FROM vacancy_cache"
+        ).fetchall()
+    return {url: description for url, description in rows if url and description}
+
+
+def reclassify_stored(specialization: str, db_file: str = DB_FILE, cache_file: str = CACHE_FILE,
+                      workers: Optional[int] = None) -> int:
+    """
+    Повторное извлечение технологий по сохраненным описаниям без обращения к API
+    Результат заменяет навыки вакансий специальности в нормализованной схеме (vacancy_skill);
+    обрабатываются только вакансии, уже загруженные в базу для этой специальности
+    :param specialization: Специальность, словарь которой используется
+    :param db_file: Путь к файлу базы данных SQLite
+    :param cache_file: Путь к файлу кэша с описаниями
+    :param workers: Количество процессов (None - по числу ядер)
+    :return: Количество обновленных вакансий
+    """
+    start_time = datetime.now()
+    tech_keywords = VacancyParser.get_tech_keywords(specialization)
+    descriptions = load_stored_descriptions(cache_file)
+
+    with CSVtoSQLiteImporter(db_file) as importer:
+        stored = importer.vacancy_urls(specialization)
+        urls = [url for url in descriptions if url in stored]
+        results = extract_skills_batch([descriptions[url] for url in urls], tech_keywords, workers=workers)
+        count = importer.replace_vacancy_skills(specialization, dict(zip(urls, results)))
+
+    print(f"Обработано описаний: {count} за {datetime.now() - start_time}")
+    return count
+
+
+if __name__ == '__main__':
+    try:
+        specialization = input('Введите специализацию (аналитик/фронтенд/бэкенд/кибербезопасность): ')
+        reclassify_stored(specialization.lower())
+    except ValueError as e:
+        print(e)
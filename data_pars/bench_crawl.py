@@ -0,0 +1,382 @@
+"""
+Офлайн-бенчмарк парсинга на локальном сервере, имитирующем API hh.ru
+
+Сервер отдает /vacancies и /vacancies/{id} из сохраненных ответов (кэш вакансий)
+или из синтетических данных, с настраиваемой задержкой, долей ошибок 5xx и ответов 429.
+Любой скрипт можно направить на сервер переменной окружения HH_API_URL (режим --serve).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import runpy
+import sqlite3 as sql
+import tempfile
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter, sleep
+from typing import Dict, List, Optional
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from db import CSVtoSQLiteImporter
+from hh_client import HH_CLIENT
+from metrics import METRICS, CrawlMetrics
+from parser_class import VacancyParser
+from response_cache import CACHE_FILE
+
+PARSER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser.py')
+
+
+def load_fixtures(cache_file: str = CACHE_FILE, limit: Optional[int] = None) -> List[Dict]:
+    """
+    Загрузка сохраненных ответов API из кэша вакансий
+    :param cache_file: Путь к файлу кэша
+    :param limit: Максимальное количество вакансий
+    :return: Список деталей вакансий
+    """
+    if not os.path.exists(cache_file):
+        return []
+    with sql.connect(cache_file) as conn:
+        query = 'SELECT body FROM vacancy_cache ORDER BY vacancy_id'
+        if limit:
+            query += f' LIMIT {int(limit)}'
+        return [json.loads(body) for body, in conn.execute(query)]
+
+
+def synthetic_fixtures(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Генерация правдоподобных вакансий, если сохраненных ответов нет
+    :param count: Количество вакансий
+    :param seed: Зерно генератора (одинаковые данные между запусками)
+    :return: Список деталей вакансий в формате API
+    """
+    rng = random.Random(seed)
+    synonyms = sorted({
+        synonym
+        for specialization in VacancyParser.SPECIALIZATION_KEYWORDS
+        for keywords in VacancyParser.get_tech_keywords(specialization).values()
+        for synonym in keywords
+    })
+    filler = ('Требуется разработчик в команду продукта. Опыт работы с высоконагруженными '
+              'системами, код-ревью, участие в проектировании. ').split()
+    experience = ['Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет', 'Более 6 лет']
+
+    vacancies = []
+    for i in range(count):
+        skills = rng.sample(synonyms, rng.randint(3, 15))
+        words = filler * 20 + skills
+        rng.shuffle(words)
+        salary_from = rng.choice([None, rng.randrange(50, 300) * 1000])
+        vacancies.append({
+            'id': str(100000 + i),
+            'name': f'Вакансия {i}',
+            'alternate_url': f'https://hh.ru/vacancy/{100000 + i}',
+            'description': f"<p>{' '.join(words)}</p>",
+            'employer': {'name': f'Компания {rng.randrange(500)}'},
+            'salary': {'from': salary_from, 'to': None, 'currency': 'RUR', 'gross': True} if salary_from else None,
+            'experience': {'name': rng.choice(experience)},
+            'schedule': {'name': rng.choice(['Полный день', 'Удаленная работа'])},
+            'key_skills': [{'name': skill} for skill in skills],
+        })
+    return vacancies
+
+
+class FakeHHServer:
+    """Локальный HTTP-сервер с ответами в формате API hh.ru"""
+
+    def __init__(self, vacancies: List[Dict], latency: float = 0.0, error_rate: float = 0.0,
+                 rate_429: float = 0.0, seed: int = 0):
+        """
+        Инициализация сервера
+        :param vacancies: Детали вакансий, которые отдает сервер
+        :param latency: Задержка каждого ответа (сек)
+        :param error_rate: Доля ответов 503
+        :param rate_429: Доля ответов 429 (с Retry-After: 0)
+        :param seed: Зерно генератора ошибок
+        """
+        self.vacancies = {str(vacancy['id']): vacancy for vacancy in vacancies}
+        self.order = list(self.vacancies)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.rng = random.Random(seed)
+        self.metrics = CrawlMetrics()
+        self._lock = threading.Lock()
+        self.httpd = None
+        self.thread = None
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Поддержка контекстного менеджера"""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Базовый адрес сервера"""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> str:
+        """Запуск сервера в фоновом потоке на свободном порту"""
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Остановка сервера"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def injected_status(self) -> Optional[int]:
+        """Код ошибки, который нужно вернуть вместо ответа (None - обычный ответ)"""
+        with self._lock:
+            value = self.rng.random()
+        if value < self.rate_429:
+            return 429
+        if value < self.rate_429 + self.error_rate:
+            return 503
+        return None
+
+    def vacancy_page(self, params: Dict[str, List[str]]) -> Dict:
+        """Страница списка вакансий в формате /vacancies"""
+        page = int(params.get('page', ['0'])[0])
+        per_page = int(params.get('per_page', ['20'])[0])
+        ids = self.order[page * per_page:(page + 1) * per_page]
+        return {
+            'found': len(self.order),
+            'pages': -(-len(self.order) // per_page),
+            'page': page,
+            'per_page': per_page,
+            'items': [{'id': vacancy_id} for vacancy_id in ids],
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Обработчик запросов FakeHHServer"""
+
+    def do_GET(self):
+        fake = self.server.fake
+        start = perf_counter()
+        if fake.latency:
+            sleep(fake.latency)
+
+        status = fake.injected_status()
+        url = urlparse(self.path)
+        body = None
+        if status is None:
+            if url.path == '/vacancies':
+                status, body = 200, fake.vacancy_page(parse_qs(url.query))
+            elif url.path.startswith('/vacancies/') and url.path[len('/vacancies/'):] in fake.vacancies:
+                status, body = 200, fake.vacancies[url.path[len('/vacancies/'):]]
+            else:
+                status = 404
+
+        data = json.dumps(body if body is not None else {'errors': [{'type': str(status)}]},
+                          ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(data)
+
+        fake.metrics.observe('server', perf_counter() - start)
+        fake.metrics.status(status)
+
+    def log_message(self, format, *args):
+        """Отключение журнала запросов в stdout"""
+
+
+@contextlib.contextmanager
+def local_api(url: str, backoff: float):
+    """Перенаправление общего HTTP-клиента на локальный сервер без кэша ответов"""
+    saved = HH_CLIENT.BASE_URL, HH_CLIENT.cache, HH_CLIENT.backoff
+    HH_CLIENT.BASE_URL, HH_CLIENT.cache, HH_CLIENT.backoff = url, None, backoff
+    try:
+        yield
+    finally:
+        HH_CLIENT.BASE_URL, HH_CLIENT.cache, HH_CLIENT.backoff = saved
+        HH_CLIENT.dead_letter = []
+
+
+def _measure(run) -> Dict:
+    """Запуск функции с замером времени, пика памяти и метрик клиента"""
+    METRICS.reset()
+    tracemalloc.start()
+    start = perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        count = run()
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    http = METRICS.report()['stages'].get('http_detail', CrawlMetrics._summary([]))
+    return {
+        'vacancies': count,
+        'seconds': elapsed,
+        'vacancies_per_sec': count / elapsed if elapsed else 0.0,
+        'p50_ms': http['p50_ms'],
+        'p99_ms': http['p99_ms'],
+        'peak_memory_mb': peak / 2 ** 20,
+        'counters': METRICS.report()['counters'],
+    }
+
+
+def bench_vacancy_parser(url: str, specialization: str, workers: int, backoff: float) -> Dict:
+    """Бенчмарк VacancyParser (при workers=1 учитывается задержка 0.5 с между запросами)"""
+    def run() -> int:
+        parser = VacancyParser('bench', specialization, workers=workers, rate_limit=1000)
+        parser.parse_vacancies()
+        return len(parser.vacancies_data)
+
+    with local_api(url, backoff):
+        return _measure(run)
+
+
+def bench_parser_script(url: str, backoff: float) -> Dict:
+    """Бенчмарк скрипта parser.py (файлы результата пишутся во временный каталог)"""
+    def run() -> int:
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with mock.patch('builtins.input', return_value='bench'):
+                    namespace = runpy.run_path(PARSER_SCRIPT, run_name='bench')
+            finally:
+                os.chdir(cwd)
+        return len(namespace['pars_vacancies'])
+
+    with local_api(url, backoff):
+        return _measure(run)
+
+
+def bench_extract(vacancies: List[Dict]) -> Dict[str, Dict]:
+    """Бенчмарк extract_tech_skills по специальностям"""
+    descriptions = [vacancy.get('description', '') for vacancy in vacancies]
+    results = {}
+    for specialization in VacancyParser.SPECIALIZATION_KEYWORDS:
+        parser = VacancyParser('bench', specialization)
+        timings = CrawlMetrics()
+        start = perf_counter()
+        for text in descriptions:
+            with timings.timer('extract'):
+                parser.extract_tech_skills(text)
+        elapsed = perf_counter() - start
+        summary = timings.report()['stages']['extract']
+        results[specialization] = {
+            'per_sec': len(descriptions) / elapsed if elapsed else 0.0,
+            'p50_ms': summary['p50_ms'],
+            'p99_ms': summary['p99_ms'],
+        }
+    return results
+
+
+def bench_import(vacancies: List[Dict], rows: int) -> Dict[str, Dict]:
+    """Бенчмарк CSVtoSQLiteImporter.import_csv на CSV из rows строк"""
+    parser = VacancyParser('bench', 'бэкенд')
+    records = [parser.build_record(vacancy) for vacancy in vacancies]
+    parser.vacancies_data = [records[i % len(records)] for i in range(rows)]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, 'bench.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            parser.save_to_csv(csv_file, with_matrix=False)
+
+        for fast in (False, True):
+            db_file = os.path.join(tmp, f'bench_{fast}.db')
+            with CSVtoSQLiteImporter(db_file) as importer, contextlib.redirect_stdout(io.StringIO()):
+                start = perf_counter()
+                count = importer.import_csv(csv_file, 'bench', fast=fast)
+                elapsed = perf_counter() - start
+            results['fast' if fast else 'default'] = {
+                'rows': count,
+                'seconds': elapsed,
+                'rows_per_sec': count / elapsed if elapsed else 0.0,
+            }
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Офлайн-бенчмарк парсинга вакансий')
+    arg_parser.add_argument('--vacancies', type=int, default=500, help='количество вакансий на сервере')
+    arg_parser.add_argument('--fixtures', default=CACHE_FILE, help='кэш вакансий с сохраненными ответами')
+    arg_parser.add_argument('--synthetic', action='store_true', help='не использовать сохраненные ответы')
+    arg_parser.add_argument('--latency', type=float, default=0.02, help='задержка ответа сервера, сек')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='доля ответов 503')
+    arg_parser.add_argument('--rate-429', type=float, default=0.0, help='доля ответов 429')
+    arg_parser.add_argument('--workers', type=int, default=8, help='параллельные запросы VacancyParser')
+    arg_parser.add_argument('--backoff', type=float, default=0.05, help='базовая пауза перед повтором, сек')
+    arg_parser.add_argument('--specialization', default='бэкенд')
+    arg_parser.add_argument('--csv-rows', type=int, default=20000, help='строк в CSV для import_csv')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--skip', nargs='*', default=[],
+                            choices=['vacancy_parser', 'parser_script', 'extract', 'import'])
+    arg_parser.add_argument('--serve', action='store_true',
+                            help='только запустить сервер (для HH_API_URL) до Ctrl+C')
+    arg_parser.add_argument('--output', help='сохранить результаты в JSON файл')
+    args = arg_parser.parse_args()
+
+    vacancies = [] if args.synthetic else load_fixtures(args.fixtures, args.vacancies)
+    source = 'кэш вакансий'
+    if not vacancies:
+        vacancies, source = synthetic_fixtures(args.vacancies, args.seed), 'синтетические данные'
+    print(f"Вакансий на сервере: {len(vacancies)} ({source})")
+
+    server = FakeHHServer(vacancies, args.latency, args.error_rate, args.rate_429, args.seed)
+    with server:
+        if args.serve:
+            print(f"Сервер запущен: HH_API_URL={server.url}")
+            with contextlib.suppress(KeyboardInterrupt):
+                server.thread.join()
+            return
+
+        results = {'parameters': vars(args)}
+        if 'vacancy_parser' not in args.skip:
+            results['vacancy_parser'] = bench_vacancy_parser(server.url, args.specialization,
+                                                             args.workers, args.backoff)
+        if 'parser_script' not in args.skip:
+            results['parser_script'] = bench_parser_script(server.url, args.backoff)
+        results['server'] = server.metrics.report()
+
+    for name in ('vacancy_parser', 'parser_script'):
+        if name in results:
+            result = results[name]
+            print(f"{name}: {result['vacancies']} вакансий, {result['vacancies_per_sec']:.1f} вакансий/сек, "
+                  f"p50 {result['p50_ms']:.1f} мс, p99 {result['p99_ms']:.1f} мс, "
+                  f"пик памяти {result['peak_memory_mb']:.1f} МБ")
+    print(f"Коды ответов сервера: {results['server']['status_codes']}")
+
+    if 'extract' not in args.skip:
+        results['extract'] = bench_extract(vacancies)
+        for specialization, result in results['extract'].items():
+            print(f"extract_tech_skills ({specialization}): {result['per_sec']:.0f} описаний/сек, "
+                  f"p50 {result['p50_ms']:.3f} мс, p99 {result['p99_ms']:.3f} мс")
+
+    if 'import' not in args.skip:
+        results['import'] = bench_import(vacancies, args.csv_rows)
+        for mode, result in results['import'].items():
+            print(f"import_csv ({mode}): {result['rows']} строк, {result['rows_per_sec']:.0f} строк/сек")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Микробенчмарк извлечения технологий: SkillMatcher против поиска по каждому синониму"""
+import re
+from time import perf_counter
+from typing import Dict, List
+
+from batch_skills import load_stored_descriptions
+from parser_class import VacancyParser
+from response_cache import CACHE_FILE
+from skill_matcher import SkillMatcher
+
+
+def legacy_extract(tech_keywords: Dict[str, List[str]], text: str) -> List[str]:
+    """Прежняя реализация: отдельный re.search для каждого синонима"""
+    if not text:
+        return []
+
+    text = text.lower()
+    found_skills = set()
+
+    for tech, keywords in tech_keywords.items():
+        for keyword in keywords:
+            if re.search(rf'\b{re.escape(keyword)}\b', text, flags=re.IGNORECASE):
+                found_skills.add(tech)
+                break
+    return list(found_skills)
+
+
+def main():
+    descriptions = list(load_stored_descriptions().values())
+    if not descriptions:
+        print(f"В {CACHE_FILE} нет сохраненных описаний, сначала запустите парсер")
+        return
+    print(f"Описаний вакансий: {len(descriptions)}")
+
+    for specialization in VacancyParser.SPECIALIZATION_KEYWORDS:
+        tech_keywords = VacancyParser.get_tech_keywords(specialization)
+
+        start = perf_counter()
+        matcher = SkillMatcher(tech_keywords)
+        build_time = perf_counter() - start
+
+        start = perf_counter()
+        expected = [legacy_extract(tech_keywords, text) for text in descriptions]
+        legacy_time = perf_counter() - start
+
+        start = perf_counter()
+        actual = [matcher.extract(text) for text in descriptions]
+        matcher_time = perf_counter() - start
+
+        mismatches = sum(set(a) != set(e) for a, e in zip(actual, expected))
+        print(
+            f"{specialization}: построение {build_time * 1000:.2f} мс, "
+            f"по синонимам {legacy_time:.3f} с, SkillMatcher {matcher_time:.3f} с "
+            f"(x{legacy_time / matcher_time:.1f}), расхождений: {mismatches}"
+        )
+
+
+if __name__ == '__main__':
+    main()
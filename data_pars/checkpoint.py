@@ -0,0 +1,123 @@
+import json
+import sqlite3 as sql
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from db import DB_FILE
+
+
+class CrawlCheckpoint:
+    """Контрольные точки обхода вакансий для возобновления и инкрементального парсинга"""
+
+    def __init__(self, crawl_key: str, db_file: str = DB_FILE):
+        """
+        Инициализация контрольных точек
+        :param crawl_key: Ключ обхода (запрос, специализация и регион)
+        :param db_file: Путь к файлу базы данных SQLite
+        """
+        self.crawl_key = crawl_key
+        self.db_file = db_file
+        # Окна по дате обрабатываются в нескольких потоках с общими контрольными точками
+        self.conn = sql.connect(db_file, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self.conn:
+            self.conn.executescript('''
+                CREATE TABLE IF NOT EXISTS crawl_runs (
+                    crawl_key TEXT PRIMARY KEY,
+                    last_finished_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS crawl_pages (
+                    crawl_key TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    vacancy_ids TEXT NOT NULL,
+                    PRIMARY KEY (crawl_key, page)
+                );
+                CREATE TABLE IF NOT EXISTS crawl_vacancies (
+                    crawl_key TEXT NOT NULL,
+                    vacancy_id TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (crawl_key, vacancy_id)
+                );
+            ''')
+
+    def last_finished(self) -> Optional[str]:
+        """Время завершения последнего полного обхода (ISO 8601) или None"""
+        row = self.conn.execute(
+            'SELECT last_finished_at FROM crawl_runs WHERE crawl_key = ?', (self.crawl_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def completed_pages(self) -> Set[int]:
+        """Номера страниц, обработанных в текущем незавершенном обходе"""
+        rows = self.conn.execute(
+            'SELECT page FROM crawl_pages WHERE crawl_key = ?', (self.crawl_key,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def page_records(self) -> List[Dict]:
+        """Записи вакансий со страниц, уже обработанных в текущем обходе"""
+        rows = self.conn.execute(
+            'SELECT vacancy_ids FROM crawl_pages WHERE crawl_key = ? ORDER BY page', (self.crawl_key,)
+        ).fetchall()
+        vacancy_ids = [vacancy_id for row in rows for vacancy_id in json.loads(row[0])]
+        records = self.stored_records(vacancy_ids)
+        return [records[vacancy_id] for vacancy_id in vacancy_ids if vacancy_id in records]
+
+    def stored_records(self, vacancy_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Сохраненные ранее записи вакансий
+        :param vacancy_ids: Список ID вакансий
+        :return: Словарь ID -> запись для найденных вакансий
+        """
+        records = {}
+        # SQLite ограничивает число параметров в одном запросе
+        for i in range(0, len(vacancy_ids), 500):
+            chunk = vacancy_ids[i:i + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            with self._lock:
+                rows = self.conn.execute(
+                    f'SELECT vacancy_id, record FROM crawl_vacancies '
+                    f'WHERE crawl_key = ? AND vacancy_id IN ({placeholders})',
+                    [self.crawl_key, *chunk]
+                ).fetchall()
+            records.update((vacancy_id, json.loads(record)) for vacancy_id, record in rows)
+        return records
+
+    def save_page(self, page: Optional[int], records: List[Dict], vacancy_ids: List[str]) -> None:
+        """
+        Фиксация обработанной страницы и полученных вакансий в одной транзакции
+        :param page: Номер страницы (None - вакансии вне страниц, например после повторной загрузки)
+        :param records: Новые записи вакансий
+        :param vacancy_ids: ID всех вакансий страницы, попавших в результат
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO crawl_vacancies VALUES (?, ?, ?, ?)',
+                [(self.crawl_key, record['id'], json.dumps(record, ensure_ascii=False), now)
+                 for record in records]
+            )
+            if page is not None:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO crawl_pages VALUES (?, ?, ?)',
+                    (self.crawl_key, page, json.dumps(vacancy_ids))
+                )
+
+    def finish(self, started_at: datetime) -> None:
+        """
+        Завершение обхода: сброс страниц и запоминание времени начала обхода
+        :param started_at: Время начала обхода (следующий инкрементальный обход начнется с него)
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM crawl_pages WHERE crawl_key = ?', (self.crawl_key,))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO crawl_runs VALUES (?, ?)',
+                (self.crawl_key, started_at.isoformat(timespec='seconds'))
+            )
+
+    def close(self) -> None:
+        """Закрытие соединения с базой данных"""
+        self.conn.close()
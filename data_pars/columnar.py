@@ -0,0 +1,93 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# Уровни опыта hh.ru в порядке возрастания
+EXPERIENCE_LEVELS = ['Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет', 'Более 6 лет']
+
+# Общие колонки вакансии, одинаковые для всех специальностей
+BASE_FIELDS = [
+    pa.field('name', pa.string()),
+    pa.field('url', pa.string()),
+    pa.field('company', pa.string()),
+    pa.field('specialization', pa.string()),
+    pa.field('salary', pa.string()),
+    pa.field('salary_from', pa.float64()),
+    pa.field('salary_to', pa.float64()),
+    pa.field('currency', pa.string()),
+    pa.field('gross', pa.bool_()),
+    pa.field('salary_rub', pa.float64()),
+    pa.field('experience', pa.dictionary(pa.int8(), pa.string(), ordered=True)),
+    pa.field('remote', pa.bool_()),
+]
+
+
+def build_schema(skills: List[str]) -> pa.Schema:
+    """Схема таблицы вакансий: общие колонки и булевы флаги навыков"""
+    return pa.schema(BASE_FIELDS + [pa.field(skill, pa.bool_()) for skill in skills])
+
+
+def _experience_array(values: List[Optional[str]]) -> pa.DictionaryArray:
+    """Упорядоченная категория опыта; неизвестные значения становятся null"""
+    index = {level: i for i, level in enumerate(EXPERIENCE_LEVELS)}
+    indices = pa.array([index.get(value) for value in values], type=pa.int8())
+    return pa.DictionaryArray.from_arrays(indices, pa.array(EXPERIENCE_LEVELS), ordered=True)
+
+
+def records_to_table(records: Iterable[Dict], skills: List[str],
+                     tracked_skills: Optional[Set[str]] = None) -> pa.Table:
+    """
+    Преобразование записей о вакансиях в таблицу Arrow
+    :param records: Записи в формате VacancyParser.build_record (+ specialization)
+    :param skills: Полный список колонок навыков
+    :param tracked_skills: Навыки, которые искались для этих записей; для остальных пишется null
+    :return: Таблица Arrow со схемой build_schema(skills)
+    """
+    records = list(records)
+    schema = build_schema(skills)
+    columns = {}
+    for field in BASE_FIELDS:
+        if field.name == 'experience':
+            columns['experience'] = _experience_array([record.get('experience') for record in records])
+        else:
+            columns[field.name] = pa.array([record.get(field.name) for record in records], type=field.type)
+
+    skill_sets = [set(record.get('skills', [])) for record in records]
+    for skill in skills:
+        if tracked_skills is not None and skill not in tracked_skills:
+            columns[skill] = pa.nulls(len(records), type=pa.bool_())
+        else:
+            columns[skill] = pa.array([skill in vacancy_skills for vacancy_skills in skill_sets], type=pa.bool_())
+
+    return pa.table([columns[field.name] for field in schema], schema=schema)
+
+
+def write_columnar(table: pa.Table, path: str) -> None:
+    """
+    Запись таблицы в колоночном формате по расширению файла
+    :param table: Таблица Arrow
+    :param path: .parquet - Parquet, .arrow/.feather - Arrow IPC
+    """
+    if os.path.splitext(path)[1] == '.parquet':
+        pq.write_table(table, path)
+    else:
+        feather.write_feather(table, path)
+
+
+def read_columnar(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Загрузка файла вакансий в pandas.DataFrame с чтением только нужных колонок
+    :param path: Путь к файлу .parquet или .arrow/.feather
+    :param columns: Список колонок (None - все)
+    :return: DataFrame с булевыми навыками, числовой зарплатой и упорядоченной категорией опыта
+    """
+    if os.path.splitext(path)[1] == '.parquet':
+        table = pq.read_table(path, columns=columns)
+    else:
+        table = feather.read_table(path, columns=columns)
+    # Навыки с null (не искались для специальности) читаются как nullable boolean
+    return table.to_pandas(types_mapper={pa.bool_(): pd.BooleanDtype()}.get)
@@ -0,0 +1,132 @@
+"""
+Неинтерактивный запуск парсинга с записью сразу в SQLite (подходит для cron)
+
+Пример:
+    python crawl.py --query разработчик --specialization бэкенд фронтенд --workers 4 --refresh
+    python crawl.py --config crawl.json
+
+Файл конфигурации - JSON с теми же ключами, что и флаги (specialization - строка или список);
+флаги командной строки имеют приоритет над файлом.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from db import DB_FILE, CSVtoSQLiteImporter
+from metrics import METRICS
+from parser_class import VacancyParser
+from rate_limiter import TokenBucket
+from sinks import CSVSink, NormalizedSQLiteSink, SQLiteSink
+
+DEFAULTS = {
+    'query': '',
+    'specialization': list(VacancyParser.SPECIALIZATION_KEYWORDS),
+    'area': 1,
+    'db': DB_FILE,
+    'table': None,
+    'upsert': False,
+    'csv': False,
+    'workers': 1,
+    'rate_limit': 2.0,
+    'resume': False,
+    'only_new': False,
+    'refresh': False,
+    'shard': False,
+    'metrics': None,
+}
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Флаги командной строки; значения по умолчанию берутся из конфигурации или DEFAULTS"""
+    arg_parser = argparse.ArgumentParser(description='Парсинг вакансий hh.ru в базу данных SQLite')
+    arg_parser.add_argument('--config', help='JSON файл с параметрами запуска')
+    arg_parser.add_argument('--query', help='строка поиска (название вакансии)')
+    arg_parser.add_argument('--specialization', nargs='+',
+                            help=f"специальности ({', '.join(VacancyParser.SPECIALIZATION_KEYWORDS)})")
+    arg_parser.add_argument('--area', type=int, help='ID региона (1 - Москва)')
+    arg_parser.add_argument('--db', help='файл базы данных')
+    arg_parser.add_argument('--table', help='дополнительно писать строки в плоскую таблицу с этим именем')
+    arg_parser.add_argument('--upsert', action='store_true', default=None,
+                            help='обновлять строки плоской таблицы по ссылке вместо добавления (нужна таблица без дублей)')
+    arg_parser.add_argument('--csv', action='store_true', default=None,
+                            help='дополнительно сохранить <специализация>_vacancies.csv')
+    arg_parser.add_argument('--workers', type=int, help='одновременные запросы деталей вакансий')
+    arg_parser.add_argument('--rate-limit', type=float, help='общий лимит запросов в секунду для всех парсеров и потоков')
+    arg_parser.add_argument('--resume', action='store_true', default=None, help='продолжить прерванный обход')
+    arg_parser.add_argument('--only-new', action='store_true', default=None,
+                            help='только вакансии после прошлого обхода')
+    arg_parser.add_argument('--refresh', action='store_true', default=None,
+                            help='обновить сохраненные вакансии, обрабатывая только изменившиеся')
+    arg_parser.add_argument('--shard', action='store_true', default=None,
+                            help='разбить поиск больше 20 страниц на окна по дате')
+    arg_parser.add_argument('--metrics', help='сохранить отчет о метриках в JSON файл')
+    return arg_parser
+
+
+def load_settings(argv: Optional[List[str]] = None) -> Dict:
+    """
+    Параметры запуска: DEFAULTS, затем файл конфигурации, затем флаги
+    :param argv: Аргументы командной строки (None - sys.argv)
+    :return: Словарь параметров
+    """
+    args = vars(build_arg_parser().parse_args(argv))
+    settings = dict(DEFAULTS)
+    config = args.pop('config')
+    if config:
+        with open(config, encoding='utf-8') as f:
+            settings.update(json.load(f))
+    settings.update({key: value for key, value in args.items() if value is not None})
+
+    if isinstance(settings['specialization'], str):
+        settings['specialization'] = [settings['specialization']]
+    settings['specialization'] = [specialization.lower() for specialization in settings['specialization']]
+    return settings
+
+
+def run(settings: Dict) -> int:
+    """
+    Парсинг всех специальностей с записью в базу данных в том же процессе
+    :param settings: Параметры запуска (см. DEFAULTS)
+    :return: Общее количество записанных вакансий
+    """
+    rate_limiter = TokenBucket(settings['rate_limit'], capacity=max(1, settings['workers']))
+    total = 0
+    with CSVtoSQLiteImporter(settings['db']) as importer:
+        for specialization in settings['specialization']:
+            try:
+                parser = VacancyParser(settings['query'], specialization, settings['area'],
+                                       workers=settings['workers'], rate_limiter=rate_limiter,
+                                       db_file=settings['db'])
+            except ValueError as e:
+                print(e)
+                continue
+
+            sinks = [NormalizedSQLiteSink(importer, specialization)]
+            if settings['table']:
+                sinks.append(SQLiteSink(importer, settings['table'], upsert=settings['upsert']))
+            if settings['csv']:
+                sinks.append(CSVSink(f"{specialization}_vacancies.csv"))
+
+            print(f"\n{specialization}: поиск '{settings['query']}'")
+            try:
+                total += parser.stream_to(sinks, resume=settings['resume'], only_new=settings['only_new'],
+                                          shard=settings['shard'], refresh=settings['refresh'])
+            except ValueError as e:
+                # Например, в плоской таблице есть дубли и уникальный индекс для --upsert не создается
+                print(e)
+
+    METRICS.save_to_db('crawl', settings['db'])
+    if settings['metrics']:
+        METRICS.save_json(settings['metrics'])
+    print(f"\nВсего записано вакансий: {total}")
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа: код возврата 0 при успехе, 1 если ничего не записано"""
+    return 0 if run(load_settings(argv)) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
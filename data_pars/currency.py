@@ -0,0 +1,54 @@
+import re
+from typing import Dict, Optional
+
+# Курсы валют к рублю для приведения зарплат (коды валют hh.ru)
+CURRENCY_RATES = {
+    'RUR': 1.0,
+    'RUB': 1.0,
+    'USD': 93.0,
+    'EUR': 100.0,
+    'KZT': 0.19,
+    'BYR': 28.5,
+    'UAH': 2.3,
+    'UZS': 0.0073,
+    'KGS': 1.05,
+    'AZN': 54.7,
+    'GEL': 34.5,
+}
+
+_SALARY_TEXT = re.compile(r'(?:от\s+(?P<from>\d+))?\s*(?:до\s+(?P<to>\d+))?\s*(?P<currency>[A-Z]{3})?', re.IGNORECASE)
+
+
+def salary_to_rub(salary_from: Optional[float], salary_to: Optional[float],
+                  currency: Optional[str], rates: Dict[str, float] = CURRENCY_RATES) -> Optional[float]:
+    """
+    Середина вилки зарплаты в рублях
+    :param salary_from: Нижняя граница
+    :param salary_to: Верхняя граница
+    :param currency: Код валюты hh.ru
+    :param rates: Таблица курсов валют к рублю
+    :return: Середина вилки (или известная граница) в рублях, None если данных нет
+    """
+    bounds = [value for value in (salary_from, salary_to) if value]
+    rate = rates.get((currency or 'RUR').upper())
+    if not bounds or rate is None:
+        return None
+    return sum(bounds) / len(bounds) * rate
+
+
+def parse_salary_text(text: Optional[str]) -> Dict:
+    """
+    Разбор строки зарплаты формата process_salary ("от 150000 до 200000 RUR")
+    :param text: Строка зарплаты
+    :return: Словарь salary_from, salary_to, currency, salary_rub
+    """
+    salary = {'salary_from': None, 'salary_to': None, 'currency': None, 'salary_rub': None}
+    match = _SALARY_TEXT.fullmatch(text.strip()) if text else None
+    if not match:
+        return salary
+
+    salary['salary_from'] = float(match['from']) if match['from'] else None
+    salary['salary_to'] = float(match['to']) if match['to'] else None
+    salary['currency'] = match['currency'].upper() if match['currency'] else None
+    salary['salary_rub'] = salary_to_rub(salary['salary_from'], salary['salary_to'], salary['currency'])
+    return salary
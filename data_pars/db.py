@@ -1,13 +1,141 @@
 import sqlite3 as sql
 import os
 import csv
-from typing import List, Dict
+import gzip
+import hashlib
+import io
+import json
+from contextlib import contextmanager
+from itertools import islice
+from time import perf_counter
+from typing import IO, Iterable, Iterator, List, Dict, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from columnar import EXPERIENCE_LEVELS, records_to_table, write_columnar
+from currency import parse_salary_text
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Корень репозитория: общая база данных, кэши и модели хранятся в нем
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_FILE = os.path.join(REPO_ROOT, 'database.db')
+
+# Кэш DataFrame, загруженных load_vacancies, в корне репозитория
+FRAME_CACHE_DIR = os.path.join(REPO_ROOT, 'dataframe_cache')
+FRAME_CACHE_LIMIT = 32
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+CSVSource = Union[str, IO]
+
+
+def _decompress(stream: IO[bytes]) -> IO[bytes]:
+    """Распаковка бинарного потока gzip/zstd по сигнатуре (несжатый поток возвращается как есть)"""
+    if hasattr(stream, 'peek'):
+        magic = stream.peek(4)[:4]
+    else:
+        position = stream.tell()
+        magic = stream.read(4)
+        stream.seek(position)
+
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=stream)
+    if magic.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ImportError("Для чтения .zst файлов установите пакет zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    return stream
+
+
+@contextmanager
+def open_csv(source: CSVSource) -> Iterator[IO[str]]:
+    """
+    Открытие CSV для чтения: путь к файлу (.csv, .csv.gz, .csv.zst) или файловый объект
+    Сжатие определяется по сигнатуре; переданный файловый объект не закрывается
+    :param source: Путь или файловый объект (текстовый или бинарный)
+    :return: Текстовый поток UTF-8
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"CSV file {source} not found")
+        with open(source, 'rb') as f:
+            with io.TextIOWrapper(_decompress(f), encoding='utf-8-sig', newline='') as text:
+                yield text
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    else:
+        text = io.TextIOWrapper(_decompress(source), encoding='utf-8-sig', newline='')
+        try:
+            yield text
+        finally:
+            # Отсоединение обертки, чтобы не закрыть поток вызывающего кода
+            text.detach()
 
-DB_FILE = 'database.db'
-TABLE_NAME = input('введите название таблицы(data_science, frontend, backend, cybersecurity):')
 
 class CSVtoSQLiteImporter:
     """Класс для импорта данных из CSV файла в SQLite базу данных"""
+
+    # Параметры SQLite для быстрого массового импорта
+    IMPORT_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+    }
+
+    # Соответствие колонок CSV полям таблицы vacancies нормализованной схемы
+    NORMALIZED_COLUMNS = {
+        'Должность': 'name', 'Name': 'name',
+        'Ссылка': 'url', 'URL': 'url',
+        'Компания': 'company',
+        'Зарплата': 'salary',
+        'Опыт': 'experience',
+        'Удаленная работа': 'remote',
+        'Area': 'area',
+        'Зарплата от': 'salary_from',
+        'Зарплата до': 'salary_to',
+        'Валюта': 'currency',
+        'До вычета налогов': 'gross',
+        'Зарплата RUB': 'salary_rub',
+        'Хэш содержимого': 'content_hash',
+    }
+
+    # SQLite ограничивает число параметров в одном запросе
+    MAX_QUERY_PARAMS = 500
+
+    # Структурированные поля зарплаты, добавленные в таблицу vacancies
+    SALARY_COLUMNS = {
+        'salary_from': 'REAL',
+        'salary_to': 'REAL',
+        'currency': 'TEXT',
+        'gross': 'INTEGER',
+        'salary_rub': 'REAL',
+    }
+
+    # Колонки вакансии, доступные в load_vacancies, и их типы pandas
+    VACANCY_DTYPES = {
+        'name': 'string',
+        'url': 'string',
+        'company': 'string',
+        'specialization': 'string',
+        'salary': 'string',
+        'salary_from': 'float64',
+        'salary_to': 'float64',
+        'currency': 'string',
+        'gross': 'boolean',
+        'salary_rub': 'float64',
+        'experience': pd.CategoricalDtype(EXPERIENCE_LEVELS, ordered=True),
+        'remote': 'boolean',
+        'area': 'Int64',
+        'content_hash': 'string',
+    }
     
     def __init__(self, db_file: str = 'database.db'):
         """
@@ -39,68 +167,755 @@ class CSVtoSQLiteImporter:
     def create_table(self, table_name: str, columns: List[str]) -> None:
         """
         Создание таблицы в базе данных
+        Если таблица уже существует, недостающие колонки добавляются через ALTER TABLE
         :param table_name: Имя таблицы
         :param columns: Список колонок
         """
         if not self.conn:
             raise ConnectionError("Database connection is not established")
 
+        with self.conn:
+            self._create_table(self.conn.cursor(), table_name, columns)
+
+    @staticmethod
+    def _create_table(cursor: sql.Cursor, table_name: str, columns: List[str]) -> None:
+        """Создание таблицы и недостающих колонок без фиксации транзакции"""
         columns_list = ', '.join([f'"{col}" TEXT' for col in columns])
-        
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                {columns_list}
+            )
+        ''')
+
+        # Новые колонки (например, навыки) в таблице, созданной ранее
+        existing = {col[1] for col in cursor.execute(f'PRAGMA table_info({table_name})')}
+        for col in columns:
+            if col not in existing:
+                cursor.execute(f'ALTER TABLE {table_name} ADD COLUMN "{col}" TEXT')
+                existing.add(col)
+
+    def key_column(self, headers: List[str]) -> str:
+        """Колонка со ссылкой на вакансию, по которой строки считаются одной вакансией"""
+        for col in headers:
+            if self.NORMALIZED_COLUMNS.get(col) == 'url':
+                return col
+        raise ValueError("Нет колонки со ссылкой на вакансию для режима обновления")
+
+    def create_unique_index(self, table_name: str, key: str) -> None:
+        """
+        Уникальный индекс по ключевой колонке (строки с пустым ключом в индекс не входят)
+        Если в таблице уже есть повторяющиеся ключи, индекс не создается: дубликаты нужно разобрать вручную
+        :param table_name: Имя таблицы
+        :param key: Ключевая колонка
+        """
         with self.conn:
-            cursor = self.conn.cursor()
-            cursor.execute(f'''
-                CREATE TABLE IF NOT EXISTS {table_name} (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    {columns_list}
-                )
-            ''')
+            self._create_unique_index(self.conn.cursor(), table_name, key)
+
+    @staticmethod
+    def _key_condition(key: str) -> str:
+        """Условие непустого ключа (частичный уникальный индекс и цель ON CONFLICT)"""
+        return f'"{key}" IS NOT NULL AND "{key}" != \'\''
+
+    @classmethod
+    def _create_unique_index(cls, cursor: sql.Cursor, table_name: str, key: str) -> None:
+        """Проверка дубликатов и создание уникального индекса без фиксации транзакции"""
+        duplicates = cursor.execute(f'''
+            SELECT "{key}", COUNT(*) FROM {table_name}
+            WHERE {cls._key_condition(key)}
+            GROUP BY "{key}" HAVING COUNT(*) > 1
+        ''').fetchall()
+        if duplicates:
+            examples = ', '.join(str(value) for value, _ in duplicates[:3])
+            raise ValueError(
+                f"В таблице {table_name} повторяются значения {key} ({len(duplicates)} шт., например: {examples}). "
+                f"Удалите дубликаты или импортируйте без режима обновления"
+            )
+        cursor.execute(f'''
+            CREATE UNIQUE INDEX IF NOT EXISTS "idx_{table_name}_{key}" ON {table_name} ("{key}")
+            WHERE {cls._key_condition(key)}
+        ''')
+
+    def _with_key(self, headers: List[str], rows: List[List]) -> List[List]:
+        """Строки с непустой ссылкой на вакансию (строку без ключа нельзя обновить при повторном импорте)"""
+        key_index = headers.index(self.key_column(headers))
+        return [row for row in rows if key_index < len(row) and row[key_index] not in (None, '')]
+
+    def _insert_query(self, table_name: str, headers: List[str], upsert: bool = False) -> str:
+        """
+        Запрос вставки строк
+        В режиме upsert существующая вакансия обновляется на месте, а неизмененная строка не перезаписывается
+        """
+        placeholders = ', '.join(['?' for _ in headers])
+        columns = ', '.join([f'"{col}"' for col in headers])
+        sql_query = f'INSERT INTO {table_name} ({columns}) VALUES ({placeholders})'
+        if upsert:
+            key = self.key_column(headers)
+            excluded = ', '.join([f'excluded."{col}"' for col in headers])
+            updates = ', '.join([f'"{col}" = excluded."{col}"' for col in headers if col != key])
+            sql_query += (f' ON CONFLICT ("{key}") WHERE {self._key_condition(key)}'
+                          f' DO UPDATE SET {updates} WHERE ({columns}) IS NOT ({excluded})')
+        return sql_query
 
-    def import_csv(self, csv_file: str, table_name: str) -> int:
+    def insert_rows(self, table_name: str, headers: List[str], rows: List[List], upsert: bool = False) -> int:
+        """
+        Вставка пачки строк в таблицу одной транзакцией
+        :param table_name: Имя таблицы
+        :param headers: Список колонок
+        :param rows: Строки со значениями в порядке колонок
+        :param upsert: Обновлять существующие вакансии вместо добавления дубликатов
+            (нужен уникальный индекс create_unique_index; строки без ссылки пропускаются)
+        :return: Количество вставленных строк
+        """
+        if not self.conn:
+            raise ConnectionError("Database connection is not established")
+
+        if upsert:
+            rows = self._with_key(headers, rows)
+        with self.conn:
+            self.conn.executemany(self._insert_query(table_name, headers, upsert), rows)
+        return len(rows)
+
+    def set_pragmas(self, pragmas: Dict[str, object]) -> None:
+        """
+        Установка параметров SQLite (PRAGMA) для текущего соединения
+        :param pragmas: Словарь имя -> значение
+        """
+        if not self.conn:
+            raise ConnectionError("Database connection is not established")
+
+        for name, value in pragmas.items():
+            self.conn.execute(f'PRAGMA {name} = {value}')
+
+    def import_csv(self, csv_file: CSVSource, table_name: str, chunk_size: int = 5000,
+                   fast: bool = False, upsert: bool = False) -> int:
         """
         Импорт данных из CSV файла в таблицу
-        :param csv_file: Путь к CSV файлу
+        Файл читается за один проход, строки вставляются пачками в одной транзакции
+        :param csv_file: Путь к CSV файлу (в том числе .gz/.zst) или файловый объект
         :param table_name: Имя таблицы для импорта
+        :param chunk_size: Количество строк в одном executemany
+        :param fast: Включить IMPORT_PRAGMAS (WAL, synchronous=NORMAL, увеличенный кэш)
+        :param upsert: Повторный импорт обновляет строки по ссылке на вакансию, а не дублирует их
+            (строки без ссылки пропускаются; если в таблице уже есть дубликаты, импорт отменяется)
         :return: Количество импортированных строк
         """
-        if not os.path.exists(csv_file):
-            raise FileNotFoundError(f"CSV file {csv_file} not found")
+        return self.import_many([csv_file], table_name, chunk_size, fast, upsert)
+
+    def import_many(self, csv_files: Iterable[CSVSource], table_name: str, chunk_size: int = 5000,
+                    fast: bool = False, upsert: bool = False) -> int:
+        """
+        Импорт нескольких CSV файлов в одну таблицу одной транзакцией
+        При ошибке в любом файле строки не импортируются ни из одного
+        :param csv_files: Пути к CSV файлам (в том числе .gz/.zst) или файловые объекты
+        :param table_name: Имя таблицы для импорта
+        :param chunk_size: Количество строк в одном executemany
+        :param fast: Включить IMPORT_PRAGMAS (WAL, synchronous=NORMAL, увеличенный кэш)
+        :param upsert: Повторный импорт обновляет строки по ссылке на вакансию, а не дублирует их
+            (строки без ссылки пропускаются; если в таблице уже есть дубликаты, импорт отменяется)
+        :return: Количество импортированных строк
+        """
+        if not self.conn:
+            self.connect()
+
+        if fast:
+            self.set_pragmas(self.IMPORT_PRAGMAS)
+
+        start_time = perf_counter()
+        cursor = self.conn.cursor()
+        count = 0
+        try:
+            # sqlite3 сам открывает транзакцию только перед INSERT, а CREATE TABLE и ALTER TABLE
+            # без явного BEGIN фиксируются сразу и не откатываются при ошибке импорта
+            if not self.conn.in_transaction:
+                cursor.execute('BEGIN')
+            for csv_file in csv_files:
+                with open_csv(csv_file) as f:
+                    count += self._import_reader(cursor, csv.reader(f), table_name, chunk_size, upsert)
+            self.conn.commit()
 
-        # Чтение заголовков из CSV
-        with open(csv_file, 'r', encoding='utf-8') as f:
+        except Exception as e:
+            if self.conn:
+                self.conn.rollback()
+            raise e
+
+        elapsed = perf_counter() - start_time
+        rate = count / elapsed if elapsed else 0.0
+        print(f"Импортировано {count} строк за {elapsed:.2f} с ({rate:.0f} строк/сек)")
+        return count
+
+    def _import_reader(self, cursor: sql.Cursor, reader: Iterator[List[str]], table_name: str,
+                       chunk_size: int, upsert: bool) -> int:
+        """
+        Вставка строк одного CSV пачками по позициям колонок (без фиксации транзакции)
+        :return: Количество строк
+        """
+        headers = next(reader, None)
+        if not headers:
+            return 0
+
+        # Создание таблицы
+        self._create_table(cursor, table_name, headers)
+        if upsert:
+            self._create_unique_index(cursor, table_name, self.key_column(headers))
+        sql_query = self._insert_query(table_name, headers, upsert)
+
+        # Импорт данных
+        width = len(headers)
+        count = 0
+        skipped = 0
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                break
+            # Пустые строки пропускаются (как в csv.DictReader), строки с пропущенными
+            # или лишними значениями выравниваются по заголовку
+            chunk = [row if len(row) == width else (row + [None] * width)[:width] for row in chunk if row]
+            if upsert:
+                with_key = self._with_key(headers, chunk)
+                skipped += len(chunk) - len(with_key)
+                chunk = with_key
+            cursor.executemany(sql_query, chunk)
+            count += len(chunk)
+
+        if skipped:
+            print(f"Пропущено строк без ссылки на вакансию: {skipped}")
+        return count
+
+    # Таблицы, индексы и триггеры нормализованной схемы
+    NORMALIZED_SCHEMA = [
+        '''
+        CREATE TABLE IF NOT EXISTS companies (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS vacancies (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            name TEXT,
+            company_id INTEGER REFERENCES companies (id),
+            salary TEXT,
+            salary_from REAL,
+            salary_to REAL,
+            currency TEXT,
+            gross INTEGER,
+            salary_rub REAL,
+            experience TEXT,
+            remote INTEGER,
+            area INTEGER
+        )
+        ''',
+        # Одна вакансия может входить в несколько специальностей; хэш строки хранится для каждой
+        '''
+        CREATE TABLE IF NOT EXISTS vacancy_specialization (
+            vacancy_id INTEGER NOT NULL REFERENCES vacancies (id),
+            specialization TEXT NOT NULL,
+            content_hash TEXT,
+            PRIMARY KEY (vacancy_id, specialization)
+        ) WITHOUT ROWID
+        ''',
+        # Навыки зависят от словаря специальности, поэтому связи хранятся по специальностям
+        '''
+        CREATE TABLE IF NOT EXISTS vacancy_skill (
+            vacancy_id INTEGER NOT NULL REFERENCES vacancies (id),
+            specialization TEXT NOT NULL,
+            skill_id INTEGER NOT NULL REFERENCES skills (id),
+            PRIMARY KEY (vacancy_id, specialization, skill_id)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_vacancy_skill_skill ON vacancy_skill (skill_id, specialization, vacancy_id)',
+        'CREATE INDEX IF NOT EXISTS idx_vacancy_specialization_specialization '
+        'ON vacancy_specialization (specialization, vacancy_id)',
+        'CREATE INDEX IF NOT EXISTS idx_vacancies_company ON vacancies (company_id)',
+        'CREATE INDEX IF NOT EXISTS idx_vacancies_experience ON vacancies (experience)',
+
+        # Счетчик изменений вакансий для кэша load_vacancies
+        # (связи с навыками меняются только вместе с content_hash в vacancy_specialization)
+        '''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+        ''',
+        "INSERT OR IGNORE INTO table_versions VALUES ('vacancies', 0)",
+    ] + [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = 'vacancies';
+        END
+        '''
+        for table in ('vacancies', 'vacancy_specialization') for event in ('INSERT', 'UPDATE', 'DELETE')
+    ]
+
+    # Таблицы нормализованной схемы, которые читает load_vacancies
+    NORMALIZED_TABLES = {'companies', 'skills', 'vacancies', 'vacancy_specialization', 'vacancy_skill',
+                         'table_versions'}
+
+    def create_normalized_schema(self) -> None:
+        """Создание нормализованной схемы: вакансии, компании, навыки, специальности и связь вакансия-навык"""
+        if not self.conn:
+            raise ConnectionError("Database connection is not established")
+
+        with self.conn:
+            for statement in self.NORMALIZED_SCHEMA:
+                self.conn.execute(statement)
+
+    def _lookup_ids(self, table_name: str, names: Set[str]) -> Dict[str, int]:
+        """Получение ID справочника (companies/skills) с добавлением новых значений"""
+        cursor = self.conn.cursor()
+        cursor.executemany(f'INSERT OR IGNORE INTO {table_name} (name) VALUES (?)', [(name,) for name in names])
+        return dict(cursor.execute(f'SELECT name, id FROM {table_name}').fetchall())
+
+    def _select_in(self, query: str, values: List, params: Iterable = ()) -> List[Tuple]:
+        """
+        Выполнение запроса с условием IN частями по MAX_QUERY_PARAMS значений
+        :param query: Запрос с подстановкой {placeholders} для значений условия IN
+        :param values: Значения условия IN
+        :param params: Параметры запроса, предшествующие значениям IN
+        :return: Строки результата всех частей
+        """
+        rows = []
+        for i in range(0, len(values), self.MAX_QUERY_PARAMS):
+            chunk = values[i:i + self.MAX_QUERY_PARAMS]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows += self.conn.execute(query.format(placeholders=placeholders), [*params, *chunk]).fetchall()
+        return rows
+
+    @staticmethod
+    def _salary_values(row: List[str], field) -> Tuple:
+        """Структурированная зарплата строки CSV; для старых файлов разбирается колонка Зарплата"""
+        if field(row, 'salary_from') is None and field(row, 'salary_to') is None:
+            salary = parse_salary_text(field(row, 'salary'))
+            return salary['salary_from'], salary['salary_to'], salary['currency'], None, salary['salary_rub']
+
+        def number(value):
+            return float(value) if value else None
+
+        gross = field(row, 'gross')
+        return (
+            number(field(row, 'salary_from')),
+            number(field(row, 'salary_to')),
+            field(row, 'currency') or None,
+            int(gross == 'Да') if gross else None,
+            number(field(row, 'salary_rub')),
+        )
+
+    def import_csv_normalized(self, csv_file: CSVSource, specialization: str, chunk_size: int = 5000) -> int:
+        """
+        Импорт CSV файла парсера в нормализованную схему
+        Поддерживаются файлы parser_class.py и parser.py; остальные колонки считаются навыками
+        Строки, хэш которых совпадает с сохраненным, не перезаписываются
+        :param csv_file: Путь к CSV файлу (в том числе .gz/.zst) или файловый объект
+        :param specialization: Специальность, к которой относятся вакансии
+        :param chunk_size: Количество строк, обрабатываемых за раз
+        :return: Количество импортированных вакансий
+        """
+        start_time = perf_counter()
+        with open_csv(csv_file) as f:
             reader = csv.reader(f)
             headers = next(reader)
+            if 'url' not in {self.NORMALIZED_COLUMNS.get(col) for col in headers}:
+                raise ValueError(f"В файле {csv_file} нет колонки со ссылкой на вакансию")
+            count, unchanged = self.insert_normalized(headers, reader, specialization, chunk_size)
+
+        elapsed = perf_counter() - start_time
+        print(f"Импортировано {count} вакансий за {elapsed:.2f} с, без изменений: {unchanged}")
+        return count
 
+    def insert_normalized(self, headers: List[str], rows: Iterable[List[str]], specialization: str,
+                          chunk_size: int = 5000) -> Tuple[int, int]:
+        """
+        Запись строк в формате CSV парсера в нормализованную схему одной транзакцией
+        :param headers: Заголовки колонок (VacancyParser.get_headers или parser.py)
+        :param rows: Строки со строковыми значениями, как при чтении CSV
+        :param specialization: Специальность, к которой относятся вакансии
+        :param chunk_size: Количество строк, обрабатываемых за раз
+        :return: Количество обработанных строк и количество строк без изменений
+        """
         if not self.conn:
             self.connect()
+        self.create_normalized_schema()
+
+        fields = {self.NORMALIZED_COLUMNS[col]: i for i, col in enumerate(headers)
+                  if col in self.NORMALIZED_COLUMNS}
+        if 'url' not in fields:
+            raise ValueError("Нет колонки со ссылкой на вакансию")
+        skill_columns = [(i, col.upper()) for i, col in enumerate(headers)
+                         if col not in self.NORMALIZED_COLUMNS]
 
+        def field(row, name):
+            i = fields.get(name)
+            return row[i] if i is not None and i < len(row) else None
+
+        rows = iter(rows)
         try:
-            # Создание таблицы
-            self.create_table(table_name, headers)
-
-            # Импорт данных
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                cursor = self.conn.cursor()
-
-                placeholders = ', '.join(['?' for _ in headers])
-                columns = ', '.join([f'"{col}"' for col in headers])
-                sql_query = f'INSERT INTO {table_name} ({columns}) VALUES ({placeholders})'
-                
-                count = 0
-                for row in reader:
-                    values = [row[col] for col in headers]
-                    cursor.execute(sql_query, values)
-                    count += 1
-
-                self.conn.commit()
-                return count
+            skill_ids = self._lookup_ids('skills', {name for _, name in skill_columns})
+            company_ids = {}
+            cursor = self.conn.cursor()
+            count = 0
+            unchanged = 0
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                count += len(chunk)
+
+                # Пропуск вакансий, содержимое которых не изменилось с прошлого импорта
+                # (хэш ответа API из CSV парсера; строки без хэша записываются всегда)
+                hashes = {field(row, 'url'): field(row, 'content_hash') or None for row in chunk}
+                stored_hashes = dict(self._select_in('''
+                    SELECT v.url, vs.content_hash
+                    FROM vacancies v
+                    JOIN vacancy_specialization vs ON vs.vacancy_id = v.id AND vs.specialization = ?
+                    WHERE v.url IN ({placeholders})
+                ''', list(hashes), [specialization]))
+                changed = [row for row in chunk if hashes[field(row, 'url')] is None
+                           or stored_hashes.get(field(row, 'url')) != hashes[field(row, 'url')]]
+                unchanged += len(chunk) - len(changed)
+                chunk = changed
+                if not chunk:
+                    continue
+
+                companies = {field(row, 'company') for row in chunk} - {None, ''} - company_ids.keys()
+                if companies:
+                    company_ids = self._lookup_ids('companies', companies)
+
+                vacancies = [(
+                    field(row, 'url'),
+                    field(row, 'name'),
+                    company_ids.get(field(row, 'company')),
+                    field(row, 'salary'),
+                    *self._salary_values(row, field),
+                    field(row, 'experience'),
+                    None if field(row, 'remote') is None else int(field(row, 'remote') == 'Да'),
+                    int(field(row, 'area')) if field(row, 'area') else None,
+                ) for row in chunk]
+                cursor.executemany('''
+                    INSERT INTO vacancies (url, name, company_id, salary, salary_from, salary_to, currency,
+                                           gross, salary_rub, experience, remote, area)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (url) DO UPDATE SET
+                        name = excluded.name, company_id = excluded.company_id,
+                        salary = excluded.salary, salary_from = excluded.salary_from,
+                        salary_to = excluded.salary_to, currency = excluded.currency,
+                        gross = excluded.gross, salary_rub = excluded.salary_rub,
+                        experience = excluded.experience,
+                        remote = excluded.remote, area = excluded.area
+                ''', vacancies)
+
+                # ID вакансий пачки для заполнения связей с навыками
+                urls = [vacancy[0] for vacancy in vacancies]
+                vacancy_ids = dict(self._select_in('SELECT url, id FROM vacancies WHERE url IN ({placeholders})',
+                                                   list(set(urls))))
+                cursor.executemany('''
+                    INSERT INTO vacancy_specialization (vacancy_id, specialization, content_hash)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (vacancy_id, specialization) DO UPDATE SET content_hash = excluded.content_hash
+                ''', [(vacancy_ids[url], specialization, hashes[url]) for url in urls])
+
+                # Навыки заменяются только для импортируемой специальности
+                cursor.executemany('DELETE FROM vacancy_skill WHERE vacancy_id = ? AND specialization = ?',
+                                   [(vacancy_id, specialization) for vacancy_id in vacancy_ids.values()])
+                cursor.executemany('INSERT OR IGNORE INTO vacancy_skill VALUES (?, ?, ?)', [
+                    (vacancy_ids[field(row, 'url')], specialization, skill_ids[name])
+                    for row in chunk for i, name in skill_columns
+                    if i < len(row) and row[i] == '1'
+                ])
+
+            self.conn.commit()
+            return count, unchanged
+
+        except Exception as e:
+            if self.conn:
+                self.conn.rollback()
+            raise e
+
+    def vacancy_urls(self, specialization: str) -> Dict[str, int]:
+        """
+        Вакансии специальности нормализованной схемы
+        :param specialization: Специальность
+        :return: Словарь ссылка на вакансию -> ID вакансии
+        """
+        if not self.conn:
+            self.connect()
+        self.create_normalized_schema()
+        return dict(self.conn.execute('''
+            SELECT v.url, v.id
+            FROM vacancies v
+            JOIN vacancy_specialization vs ON vs.vacancy_id = v.id
+            WHERE vs.specialization = ?
+        ''', (specialization,)).fetchall())
+
+    def replace_vacancy_skills(self, specialization: str, skills: Dict[str, Iterable[str]]) -> int:
+        """
+        Замена навыков вакансий специальности в нормализованной схеме одной транзакцией
+        Учитываются только вакансии, уже входящие в специальность (vacancy_specialization)
+        :param specialization: Специальность
+        :param skills: Ссылка на вакансию -> названия навыков
+        :return: Количество обновленных вакансий
+        """
+        vacancy_ids = self.vacancy_urls(specialization)
+        try:
+            cursor = self.conn.cursor()
+            skills = {vacancy_ids[url]: {name.upper() for name in names}
+                      for url, names in skills.items() if url in vacancy_ids}
+            skill_ids = self._lookup_ids('skills', {name for names in skills.values() for name in names})
+
+            cursor.executemany('DELETE FROM vacancy_skill WHERE vacancy_id = ? AND specialization = ?',
+                               [(vacancy_id, specialization) for vacancy_id in skills])
+            cursor.executemany('INSERT INTO vacancy_skill VALUES (?, ?, ?)', [
+                (vacancy_id, specialization, skill_ids[name])
+                for vacancy_id, names in skills.items() for name in names
+            ])
+            # Связи изменились без изменения vacancy_specialization, кэш load_vacancies сбрасывается явно
+            cursor.execute("UPDATE table_versions SET version = version + 1 WHERE table_name = 'vacancies'")
+
+            self.conn.commit()
+            return len(skills)
 
         except Exception as e:
             if self.conn:
                 self.conn.rollback()
             raise e
 
+    def skill_frequency(self, specialization: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Частота навыков по вакансиям нормализованной схемы
+        :param specialization: Специальность (None - по всем специальностям)
+        :return: Список (навык, количество вакансий) по убыванию частоты
+        """
+        if not self.conn:
+            self.connect()
+
+        query = '''
+            SELECT s.name, COUNT(DISTINCT vs.vacancy_id) AS cnt
+            FROM vacancy_skill vs
+            JOIN skills s ON s.id = vs.skill_id
+        '''
+        params = []
+        if specialization:
+            query += ' WHERE vs.specialization = ?'
+            params.append(specialization)
+        query += ' GROUP BY vs.skill_id ORDER BY cnt DESC'
+        return self.conn.execute(query, params).fetchall()
+
+    def skill_cooccurrence(self, specialization: Optional[str] = None,
+                           min_count: int = 1) -> List[Tuple[str, str, int]]:
+        """
+        Совместная встречаемость пар навыков в вакансиях
+        :param specialization: Специальность (None - по всем специальностям)
+        :param min_count: Минимальное количество вакансий с парой навыков
+        :return: Список (навык, навык, количество вакансий) по убыванию частоты
+        """
+        if not self.conn:
+            self.connect()
+
+        query = '''
+            SELECT sa.name, sb.name, COUNT(DISTINCT a.vacancy_id) AS cnt
+            FROM vacancy_skill a
+            JOIN vacancy_skill b ON b.vacancy_id = a.vacancy_id AND b.specialization = a.specialization
+                                AND b.skill_id > a.skill_id
+            JOIN skills sa ON sa.id = a.skill_id
+            JOIN skills sb ON sb.id = b.skill_id
+        '''
+        params = []
+        if specialization:
+            query += ' WHERE a.specialization = ?'
+            params.append(specialization)
+        query += ' GROUP BY a.skill_id, b.skill_id HAVING cnt >= ? ORDER BY cnt DESC'
+        params.append(min_count)
+        return self.conn.execute(query, params).fetchall()
+
+    def export_columnar(self, path: str, specialization: Optional[str] = None) -> int:
+        """
+        Выгрузка вакансий нормализованной схемы в колоночный файл (Parquet или Arrow IPC)
+        Вакансия из нескольких специальностей выгружается строкой для каждой специальности
+        Схема совпадает с VacancyParser.save_columnar: навыки, которые не искались для специальности
+        парсера, заполняются null (навыки вне словарей парсера, например из parser.py, добавляются
+        в конец и считаются искомыми для всех вакансий)
+        :param path: Путь к файлу .parquet/.arrow
+        :param specialization: Специальность (None - все специальности в одном файле)
+        :return: Количество выгруженных вакансий
+        """
+        if not self.conn:
+            self.connect()
+
+        query = '''
+            SELECT v.id, v.name, v.url, c.name, vs.specialization, v.salary, v.salary_from, v.salary_to,
+                   v.currency, v.gross, v.salary_rub, v.experience, v.remote
+            FROM vacancy_specialization vs
+            JOIN vacancies v ON v.id = vs.vacancy_id
+            LEFT JOIN companies c ON c.id = v.company_id
+        '''
+        params = []
+        if specialization:
+            query += ' WHERE vs.specialization = ?'
+            params.append(specialization)
+
+        fields = ['name', 'url', 'company', 'specialization', 'salary', 'salary_from', 'salary_to',
+                  'currency', 'gross', 'salary_rub', 'experience', 'remote']
+        records = {}
+        for row in self.conn.execute(query, params):
+            record = dict(zip(fields, row[1:]))
+            record['gross'] = None if record['gross'] is None else bool(record['gross'])
+            record['remote'] = None if record['remote'] is None else bool(record['remote'])
+            record['skills'] = []
+            records[row[0], record['specialization']] = record
+
+        for vacancy_id, vacancy_specialization, skill in self.conn.execute(
+                'SELECT vs.vacancy_id, vs.specialization, s.name '
+                'FROM vacancy_skill vs JOIN skills s ON s.id = vs.skill_id'):
+            record = records.get((vacancy_id, vacancy_specialization))
+            if record is not None:
+                record['skills'].append(skill)
+
+        # parser_class через checkpoint и metrics сам импортирует db
+        from parser_class import VacancyParser
+
+        skills = VacancyParser.all_skills()
+        known = set(skills)
+        extra = [row[0] for row in self.conn.execute('SELECT name FROM skills ORDER BY id') if row[0] not in known]
+        skills += extra
+
+        groups = {}
+        for record in records.values():
+            groups.setdefault(record['specialization'], []).append(record)
+        # Навыки, которые искались для специальности; для специальностей вне парсера - все навыки
+        tracked = {name: set(VacancyParser.get_tech_keywords(name)) | set(extra)
+                   for name in VacancyParser.SPECIALIZATION_KEYWORDS}
+        tables = [records_to_table(group, skills, tracked.get(group_specialization))
+                  for group_specialization, group in groups.items()]
+        write_columnar(pa.concat_tables(tables) if tables else records_to_table([], skills), path)
+        return len(records)
+
+    @classmethod
+    def load_vacancies(cls, specialization: Optional[str] = None, columns: Optional[List[str]] = None,
+                       where: Optional[str] = None, params: Iterable = (), db_file: str = DB_FILE,
+                       chunk_size: int = 10000, cache_dir: Optional[str] = FRAME_CACHE_DIR) -> pd.DataFrame:
+        """
+        Загрузка вакансий нормализованной схемы в DataFrame
+        Отбор колонок и строк выполняется в SQL, строки читаются пачками; результат
+        кэшируется на диске до следующего изменения вакансий
+        :param specialization: Специальность (None - все специальности; вакансия из нескольких
+            специальностей встречается строкой для каждой из них)
+        :param columns: Колонки VACANCY_DTYPES и навыки (None - все колонки и встречающиеся навыки)
+        :param where: Дополнительное условие SQL по колонкам vacancies (псевдоним v) и
+            vacancy_specialization (псевдоним vs), например 'v.salary_rub > ?'
+        :param params: Параметры условия where
+        :param db_file: Путь к файлу базы данных
+        :param chunk_size: Количество строк, читаемых за раз
+        :param cache_dir: Каталог кэша (None - без кэша)
+        :return: DataFrame с индексом id вакансии; навыки - булевы колонки в верхнем регистре
+        """
+        if not os.path.exists(db_file):
+            raise FileNotFoundError(f"Database file {db_file} not found")
+
+        params = list(params)
+        requested = list(cls.VACANCY_DTYPES) if columns is None else list(columns)
+        base = [col for col in requested if col in cls.VACANCY_DTYPES]
+        skills = [col.upper() for col in requested if col not in cls.VACANCY_DTYPES]
+
+        with cls(db_file) as importer:
+            conn = importer.conn
+            # Загрузчик только читает базу: схема создается при импорте
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            missing = cls.NORMALIZED_TABLES - tables
+            if missing:
+                raise ValueError(f"В базе {db_file} нет таблиц нормализованной схемы: {', '.join(sorted(missing))}")
+
+            # Снимок таблицы: счетчик изменений, количество строк и последний id
+            state = list(conn.execute(
+                "SELECT (SELECT version FROM table_versions WHERE table_name = 'vacancies'), COUNT(*), MAX(id) "
+                "FROM vacancies"
+            ).fetchone())
+
+            cache_file = None
+            if cache_dir:
+                key = json.dumps([os.path.abspath(db_file), specialization, columns, where, params],
+                                 ensure_ascii=False, default=str)
+                cache_file = os.path.join(cache_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.pkl")
+                if os.path.exists(cache_file):
+                    cached = pd.read_pickle(cache_file)
+                    if cached['state'] == state:
+                        return cached['frame']
+
+            conditions, filter_params = [], []
+            if specialization is not None:
+                conditions.append('vs.specialization = ?')
+                filter_params.append(specialization)
+            if where:
+                conditions.append(f'({where})')
+                filter_params.extend(params)
+            where_sql = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+            sources = {'company': 'c.name', 'specialization': 'vs.specialization', 'content_hash': 'vs.content_hash'}
+            select = ''.join(f', {sources.get(col, "v." + col)} AS "{col}"' for col in base)
+            tables = 'vacancy_specialization vs JOIN vacancies v ON v.id = vs.vacancy_id'
+            join = ' LEFT JOIN companies c ON c.id = v.company_id' if 'company' in base else ''
+            dtypes = {col: cls.VACANCY_DTYPES[col] for col in base}
+            chunks = [
+                chunk.astype(dtypes) for chunk in pd.read_sql_query(
+                    f'SELECT v.id AS id, vs.specialization AS membership{select} '
+                    f'FROM {tables}{join}{where_sql} ORDER BY v.id, vs.specialization',
+                    conn, params=filter_params, chunksize=chunk_size
+                )
+            ]
+            frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(
+                columns=['id', 'membership', *base]
+            ).astype({'id': 'int64', **dtypes})
+            # Строки различаются парой (вакансия, специальность)
+            rows_index = pd.MultiIndex.from_arrays([frame.pop('id'), frame.pop('membership')])
+
+            # Флаги навыков: связи только отобранных вакансий и запрошенных навыков
+            skill_ids = dict(conn.execute('SELECT name, id FROM skills ORDER BY id').fetchall())
+            names = list(skill_ids) if columns is None else skills
+            positions = {skill_ids[name]: i for i, name in enumerate(names) if name in skill_ids}
+            flags = np.zeros((len(frame), len(names)), dtype=bool)
+            if positions:
+                skill_filter = '' if columns is None else \
+                    f" {'AND' if conditions else 'WHERE'} vk.skill_id IN ({', '.join('?' for _ in positions)})"
+                cursor = conn.execute(
+                    f'SELECT vk.vacancy_id, vk.specialization, vk.skill_id FROM vacancy_skill vk '
+                    f'JOIN vacancy_specialization vs '
+                    f'ON vs.vacancy_id = vk.vacancy_id AND vs.specialization = vk.specialization '
+                    f'JOIN vacancies v ON v.id = vk.vacancy_id{where_sql}{skill_filter}',
+                    filter_params + ([] if columns is None else list(positions))
+                )
+                while True:
+                    links = cursor.fetchmany(chunk_size)
+                    if not links:
+                        break
+                    vacancy_ids, memberships, link_skills = zip(*links)
+                    rows = rows_index.get_indexer(pd.MultiIndex.from_arrays([vacancy_ids, memberships]))
+                    flags[rows, [positions[skill_id] for skill_id in link_skills]] = True
+
+            if columns is None:
+                used = flags.any(axis=0)
+                flags, names = flags[:, used], [name for name, keep in zip(names, used) if keep]
+            frame = pd.concat([frame, pd.DataFrame(flags, columns=names)], axis=1)
+            frame.index = pd.Index(rows_index.get_level_values(0), name='id', dtype='int64')
+            if columns is not None:
+                frame = frame[[col if col in cls.VACANCY_DTYPES else col.upper() for col in columns]]
+
+        if cache_file:
+            os.makedirs(cache_dir, exist_ok=True)
+            pd.to_pickle({'state': state, 'frame': frame}, cache_file)
+
+            # Удаление самых старых записей сверх лимита
+            entries = sorted((os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                              if name.endswith('.pkl')), key=os.path.getmtime)
+            for path in entries[:-FRAME_CACHE_LIMIT]:
+                os.remove(path)
+        return frame
+
     @staticmethod
     def get_table_info(db_file: str, table_name: str) -> Dict:
         """
@@ -0,0 +1,32 @@
+import hashlib
+import json
+from typing import Dict
+
+# Поля ответа API, изменение которых означает изменение вакансии
+VACANCY_HASH_FIELDS = ['name', 'description', 'salary', 'experience', 'schedule', 'key_skills']
+
+
+def vacancy_hash(vacancy: Dict) -> str:
+    """
+    Хэш содержимого вакансии: описание и ключевые поля ответа API
+    :param vacancy: Детали вакансии
+    :return: Шестнадцатеричный SHA-1
+    """
+    content = {name: vacancy.get(name) for name in VACANCY_HASH_FIELDS}
+    content['employer'] = (vacancy.get('employer') or {}).get('name')
+    data = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def file_hash(*paths: str) -> str:
+    """
+    Хэш содержимого файлов (снимок данных для ключей кэша)
+    :param paths: Пути к файлам
+    :return: Шестнадцатеричный SHA-1
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,226 @@
+import os
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import perf_counter, sleep
+from typing import Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import METRICS
+from rate_limiter import TokenBucket
+from response_cache import CacheEntry, ResponseCache
+
+
+class HHClient:
+    """HTTP-клиент для API hh.ru с пулом соединений и повторными попытками"""
+
+    # Адрес API можно переопределить переменной окружения HH_API_URL (локальный тестовый сервер)
+    BASE_URL = os.environ.get('HH_API_URL', 'https://api.hh.ru')
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # Частота повторной загрузки dead_letter, если ограничитель не передан
+    RETRY_RATE = 2.0
+
+    def __init__(self, max_retries: int = 3, backoff: float = 1.0,
+                 pool_size: int = 10, timeout: float = 10,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Инициализация клиента
+        :param max_retries: Количество повторных попыток при 429/5xx и сетевых ошибках
+        :param backoff: Базовая задержка экспоненциального ожидания (сек)
+        :param pool_size: Размер пула keep-alive соединений
+        :param timeout: Таймаут одного запроса (сек)
+        :param cache: Кэш деталей вакансий (None - без кэширования)
+        """
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.dead_letter = []
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Разбор заголовка Retry-After (секунды или HTTP-дата)"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def request(self, path: str, params: Optional[Dict] = None,
+                headers: Optional[Dict] = None) -> requests.Response:
+        """
+        GET-запрос к API с экспоненциальным ожиданием между попытками
+        :param path: Путь относительно BASE_URL
+        :param params: Параметры запроса
+        :param headers: Дополнительные заголовки запроса
+        :return: Ответ сервера
+        """
+        url = f'{self.BASE_URL}{path}'
+        stage = 'http_list' if path == '/vacancies' else 'http_detail'
+        for attempt in range(self.max_retries + 1):
+            delay = self.backoff * 2 ** attempt
+            if attempt:
+                METRICS.count('retries')
+            start = perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                METRICS.count('network_errors')
+                if attempt == self.max_retries:
+                    raise
+                with METRICS.timer('retry_wait'):
+                    sleep(delay)
+                continue
+            METRICS.observe(stage, perf_counter() - start)
+            METRICS.status(response.status_code)
+
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                retry_after = self._retry_after(response)
+                with METRICS.timer('retry_wait'):
+                    sleep(retry_after if retry_after is not None else delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """GET-запрос к API с разбором JSON-ответа"""
+        return self.request(path, params=params).json()
+
+    def cache_entry(self, vacancy_id: str) -> Optional[CacheEntry]:
+        """Запись кэша для вакансии или None (попадание в свежую запись учитывается в метриках)"""
+        if not self.cache:
+            return None
+        entry = self.cache.get(vacancy_id)
+        if entry and entry.fresh:
+            METRICS.count('cache_hits')
+        return entry
+
+    def fetch_vacancy(self, vacancy_id: str, entry: Optional[CacheEntry] = None, lookup: bool = True) -> Dict:
+        """
+        Получение деталей вакансии через кэш
+        Устаревшие записи перепроверяются условным запросом по ETag
+        :param vacancy_id: ID вакансии
+        :param entry: Запись кэша, уже полученная вызывающим кодом через cache_entry
+        :param lookup: Искать ли вакансию в кэше (False - кэш уже проверен, его результат передан в entry)
+        """
+        if lookup:
+            entry = self.cache_entry(vacancy_id)
+        if entry and entry.fresh:
+            return entry.body
+
+        headers = {'If-None-Match': entry.etag} if entry and entry.etag else None
+        response = self.request(f'/vacancies/{vacancy_id}', headers=headers)
+        if response.status_code == 304 and entry:
+            METRICS.count('cache_revalidated')
+            self.cache.touch(vacancy_id)
+            return entry.body
+
+        vacancy = response.json()
+        if self.cache:
+            self.cache.put(vacancy_id, vacancy, response.headers.get('ETag'))
+        return vacancy
+
+    def get_vacancies(self, params: Dict) -> Dict:
+        """Получение страницы списка вакансий"""
+        return self.get('/vacancies', params=params)
+
+    def get_vacancy(self, vacancy_id: str, entry: Optional[CacheEntry] = None, lookup: bool = True) -> Dict:
+        """
+        Получение деталей вакансии; при неудаче ID попадает в dead_letter (кроме удаленных вакансий, 404)
+        Параметры entry и lookup передаются в fetch_vacancy
+        """
+        try:
+            return self.fetch_vacancy(vacancy_id, entry, lookup)
+        except requests.exceptions.RequestException as e:
+            if getattr(e.response, 'status_code', None) != 404:
+                with self._lock:
+                    self.dead_letter.append(vacancy_id)
+            raise
+
+    def retry_dead_letter(self, vacancy_ids: Optional[List[str]] = None,
+                          rate_limiter: Optional[TokenBucket] = None) -> List[Dict]:
+        """
+        Повторное получение вакансий, которые не удалось загрузить
+        :param vacancy_ids: Повторить только эти ID (None - весь список dead_letter)
+        :param rate_limiter: Ограничитель частоты запросов (None - собственный, RETRY_RATE в секунду)
+        :return: Список успешно полученных вакансий
+        """
+        with self._lock:
+            if vacancy_ids is None:
+                vacancy_ids, self.dead_letter = self.dead_letter, []
+            else:
+                wanted = set(vacancy_ids)
+                vacancy_ids = [vacancy_id for vacancy_id in self.dead_letter if vacancy_id in wanted]
+                self.dead_letter = [vacancy_id for vacancy_id in self.dead_letter if vacancy_id not in wanted]
+        if vacancy_ids:
+            print(f"Повторная загрузка {len(vacancy_ids)} вакансий...")
+
+        rate_limiter = rate_limiter or TokenBucket(self.RETRY_RATE)
+        vacancies = []
+        for vacancy_id in vacancy_ids:
+            with METRICS.timer('rate_limit_wait'):
+                rate_limiter.acquire()
+            try:
+                vacancies.append(self.fetch_vacancy(vacancy_id))
+            except requests.exceptions.RequestException as e:
+                print(f"Не удалось получить вакансию {vacancy_id}: {e}")
+        return vacancies
+
+
+class FetchRegistry:
+    """Общий реестр загрузки деталей: вакансия, нужная нескольким парсерам, запрашивается один раз"""
+
+    def __init__(self):
+        self._in_flight = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def fetch(self, vacancy_id: str, loader: Callable[[str], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Загрузка вакансии без дублирования одновременных запросов
+        Повторные обращения после завершения загрузки обслуживаются кэшем ответов
+        :param vacancy_id: ID вакансии
+        :param loader: Функция загрузки деталей вакансии
+        :return: Детали вакансии или None
+        """
+        with self._lock:
+            if vacancy_id in self._seen:
+                self.duplicates += 1
+            self._seen.add(vacancy_id)
+            future = self._in_flight.get(vacancy_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[vacancy_id] = future
+
+        if owner:
+            try:
+                future.set_result(loader(vacancy_id))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._in_flight[vacancy_id]
+        return future.result()
+
+
+# Общий клиент для всех скриптов парсинга; файл кэша открывается при первом запросе деталей
+HH_CLIENT = HHClient(cache=ResponseCache())
@@ -0,0 +1,160 @@
+import json
+import sqlite3 as sql
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, List
+
+from db import DB_FILE
+
+# Границы корзин гистограммы длительностей (мс)
+HISTOGRAM_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Перцентиль отсортированного списка (ближайший ранг)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+class CrawlMetrics:
+    """Потокобезопасный сбор метрик этапов парсинга: длительности, счетчики и коды ответов"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Сброс накопленных метрик (начало нового запуска)"""
+        with self._lock:
+            self.started_at = datetime.now()
+            self.durations = {}
+            self.counters = {}
+            self.status_codes = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Добавление длительности этапа"""
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Увеличение счетчика"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def status(self, code: int) -> None:
+        """Учет HTTP-кода ответа"""
+        with self._lock:
+            self.status_codes[code] = self.status_codes.get(code, 0) + 1
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Замер длительности блока кода как этапа stage"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, perf_counter() - start)
+
+    @staticmethod
+    def _summary(values: List[float]) -> Dict:
+        """Сводка по длительностям этапа (в мс) с гистограммой"""
+        values = sorted(values)
+        histogram = {f'le_{bound}': 0 for bound in HISTOGRAM_BUCKETS_MS}
+        histogram['le_inf'] = 0
+        for value in values:
+            ms = value * 1000
+            bucket = next((f'le_{bound}' for bound in HISTOGRAM_BUCKETS_MS if ms <= bound), 'le_inf')
+            histogram[bucket] += 1
+
+        return {
+            'count': len(values),
+            'total_ms': sum(values) * 1000,
+            'mean_ms': sum(values) / len(values) * 1000 if values else 0.0,
+            'p50_ms': _percentile(values, 50) * 1000,
+            'p90_ms': _percentile(values, 90) * 1000,
+            'p99_ms': _percentile(values, 99) * 1000,
+            'max_ms': values[-1] * 1000 if values else 0.0,
+            'histogram': histogram,
+        }
+
+    def report(self) -> Dict:
+        """Машиночитаемый отчет о запуске"""
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self.durations.items()}
+            counters = dict(self.counters)
+            status_codes = {str(code): count for code, count in self.status_codes.items()}
+            started_at = self.started_at
+
+        return {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'elapsed_s': (datetime.now() - started_at).total_seconds(),
+            'stages': {stage: self._summary(values) for stage, values in durations.items()},
+            'counters': counters,
+            'status_codes': status_codes,
+        }
+
+    def save_json(self, path: str) -> Dict:
+        """Сохранение отчета в JSON-файл"""
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def save_to_db(self, run_name: str, db_file: str = DB_FILE) -> int:
+        """
+        Сохранение отчета в SQLite для сравнения запусков
+        :param run_name: Название запуска (например, ключ обхода)
+        :param db_file: Путь к файлу базы данных
+        :return: ID запуска в таблице crawl_metrics
+        """
+        report = self.report()
+        with sql.connect(db_file) as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS crawl_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_name TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    elapsed_s REAL NOT NULL,
+                    report TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS crawl_stage_metrics (
+                    run_id INTEGER NOT NULL REFERENCES crawl_metrics (id),
+                    stage TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    total_ms REAL NOT NULL,
+                    p50_ms REAL NOT NULL,
+                    p99_ms REAL NOT NULL,
+                    max_ms REAL NOT NULL,
+                    PRIMARY KEY (run_id, stage)
+                );
+            ''')
+            cursor = conn.execute(
+                'INSERT INTO crawl_metrics (run_name, started_at, elapsed_s, report) VALUES (?, ?, ?, ?)',
+                (run_name, report['started_at'], report['elapsed_s'], json.dumps(report, ensure_ascii=False))
+            )
+            run_id = cursor.lastrowid
+            conn.executemany('INSERT INTO crawl_stage_metrics VALUES (?, ?, ?, ?, ?, ?, ?)', [
+                (run_id, stage, summary['count'], summary['total_ms'],
+                 summary['p50_ms'], summary['p99_ms'], summary['max_ms'])
+                for stage, summary in report['stages'].items()
+            ])
+        return run_id
+
+    def print_summary(self) -> None:
+        """Краткий вывод метрик этапов"""
+        report = self.report()
+        for stage, summary in sorted(report['stages'].items()):
+            print(f"{stage}: {summary['count']} раз, всего {summary['total_ms'] / 1000:.2f} с, "
+                  f"p50 {summary['p50_ms']:.1f} мс, p99 {summary['p99_ms']:.1f} мс")
+        if report['counters']:
+            print(f"Счетчики: {report['counters']}")
+        if report['status_codes']:
+            print(f"Коды ответов: {report['status_codes']}")
+
+
+# Общий сборщик метрик для всех модулей парсинга
+METRICS = CrawlMetrics()
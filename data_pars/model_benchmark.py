@@ -0,0 +1,266 @@
+"""
+Сравнение моделей зарплаты с фиксированными фолдами, пулом процессов и кэшем оценок
+
+Каждая задача (модель, параметры, фолд) считается один раз: оценка сохраняется
+по хэшу данных и параметрам, поэтому после изменения сетки пересчитываются
+только новые комбинации.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3 as sql
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import KFold, ParameterGrid
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.neural_network import MLPRegressor
+from sklearn.svm import SVR
+
+from db import DB_FILE
+from salary_model import (MODEL_DIR, TARGET_COLUMN, build_features, read_vacancies_csv, read_vacancies_db,
+                          skill_columns)
+
+# Кэш оценок рядом с сохраненными моделями
+CACHE_FILE = os.path.join(MODEL_DIR, 'benchmark_cache.db')
+
+# Модели и сетки параметров из анализа вакансий: имя -> (класс, фиксированные параметры, сетка)
+MODELS = {
+    'LinearRegression': (LinearRegression, {}, {
+        'fit_intercept': [True, False],
+        'positive': [True, False],
+    }),
+    'SVR': (SVR, {}, {
+        'C': [0.1, 1, 10],
+        'kernel': ['linear', 'rbf'],
+        'epsilon': [0.01, 0.1],
+    }),
+    'KNeighborsRegressor': (KNeighborsRegressor, {}, {
+        'n_neighbors': [3, 5, 7],
+        'weights': ['uniform', 'distance'],
+        'p': [1, 2],
+    }),
+    'RandomForestRegressor': (RandomForestRegressor, {'random_state': 30}, {
+        'n_estimators': [50, 100],
+        'max_depth': [None, 5, 10],
+        'min_samples_split': [2, 5],
+        'max_features': ['sqrt', 0.5],
+    }),
+    'GradientBoostingRegressor': (GradientBoostingRegressor, {'random_state': 30}, {
+        'n_estimators': [50, 100],
+        'learning_rate': [0.05, 0.1],
+        'max_depth': [3, 5],
+        'min_samples_split': [2, 5],
+    }),
+    'MLPRegressor': (MLPRegressor, {'max_iter': 1000, 'random_state': 30}, {
+        'hidden_layer_sizes': [(50,), (100,)],
+        'activation': ['relu', 'tanh'],
+        'alpha': [0.0001, 0.001],
+        'learning_rate_init': [0.001, 0.01],
+    }),
+}
+
+# Данные рабочего процесса, передаются один раз в инициализаторе пула
+_worker_data = None
+
+
+def dataset_hash(X: np.ndarray, y: np.ndarray, n_splits: int, seed: int) -> str:
+    """Хэш признаков, целевой переменной и разбиения на фолды"""
+    digest = hashlib.sha1(f'{n_splits}:{seed}:{X.shape}'.encode('utf-8'))
+    digest.update(np.ascontiguousarray(X, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def params_key(params: Dict) -> str:
+    """Каноническое JSON-представление параметров (ключ кэша)"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def model_key(model_name: str) -> str:
+    """Ключ модели в кэше: имя и фиксированные параметры MODELS (при их изменении оценки пересчитываются)"""
+    return f'{model_name}:{params_key(MODELS[model_name][1])}'
+
+
+def make_folds(n_rows: int, n_splits: int = 5, seed: int = 30) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Фиксированное разбиение на фолды (одинаковое для всех моделей и запусков)"""
+    return list(KFold(n_splits=n_splits, shuffle=True, random_state=seed).split(np.arange(n_rows)))
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: List[Tuple[np.ndarray, np.ndarray]]) -> None:
+    """Сохранение данных и фолдов в рабочем процессе"""
+    global _worker_data
+    _worker_data = (X, y, folds)
+
+
+def _run_task(task: Tuple[str, str, int]) -> Tuple[str, str, int, float, float]:
+    """
+    Обучение модели на одном фолде в рабочем процессе
+    :param task: Имя модели, параметры (JSON), номер фолда
+    :return: Имя модели, параметры, фолд, MAE на проверочной части, время обучения
+    """
+    model_name, key, fold = task
+    X, y, folds = _worker_data
+    model_class, fixed_params, _ = MODELS[model_name]
+    params = {name: tuple(value) if isinstance(value, list) else value for name, value in json.loads(key).items()}
+    train, test = folds[fold]
+
+    start = perf_counter()
+    estimator = model_class(**{**fixed_params, **params}).fit(X[train], y[train])
+    fit_time = perf_counter() - start
+    return model_name, key, fold, mean_absolute_error(y[test], estimator.predict(X[test])), fit_time
+
+
+class ScoreCache:
+    """Кэш оценок (модель, параметры, фолд) в SQLite"""
+
+    def __init__(self, db_file: str = CACHE_FILE):
+        """
+        Инициализация кэша
+        :param db_file: Путь к файлу базы данных кэша
+        """
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        self.conn = sql.connect(db_file)
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS model_scores (
+                    data_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    fold INTEGER NOT NULL,
+                    mae REAL NOT NULL,
+                    fit_seconds REAL NOT NULL,
+                    PRIMARY KEY (data_hash, model, params, fold)
+                )
+            ''')
+
+    def scores(self, data_hash: str) -> Dict[Tuple[str, str, int], Tuple[float, float]]:
+        """Все сохраненные оценки для набора данных"""
+        rows = self.conn.execute(
+            'SELECT model, params, fold, mae, fit_seconds FROM model_scores WHERE data_hash = ?', (data_hash,)
+        )
+        return {(model, params, fold): (mae, fit_seconds) for model, params, fold, mae, fit_seconds in rows}
+
+    def save(self, data_hash: str, results: List[Tuple[str, str, int, float, float]]) -> None:
+        """Сохранение оценок задач"""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO model_scores VALUES (?, ?, ?, ?, ?, ?)',
+                                  [(data_hash, *result) for result in results])
+
+    def close(self) -> None:
+        """Закрытие соединения с базой данных"""
+        self.conn.close()
+
+
+def compare_models(X: np.ndarray, y: np.ndarray, models: Optional[List[str]] = None,
+                   grids: Optional[Dict[str, Dict]] = None, n_splits: int = 5, seed: int = 30,
+                   workers: Optional[int] = None, cache_file: Optional[str] = CACHE_FILE) -> pd.DataFrame:
+    """
+    Перекрестная проверка моделей по сеткам параметров
+    :param X: Матрица признаков
+    :param y: Зарплата
+    :param models: Имена моделей из MODELS (None - все)
+    :param grids: Сетки параметров вместо сеток MODELS (имя модели -> сетка)
+    :param n_splits: Количество фолдов
+    :param seed: Зерно разбиения на фолды
+    :param workers: Количество процессов (None - по числу ядер, 1 - без пула)
+    :param cache_file: Файл кэша оценок (None - без кэша)
+    :return: DataFrame model, params, mae, mae_std, fit_seconds по возрастанию MAE
+    """
+    models = models or list(MODELS)
+    grids = grids or {}
+    folds = make_folds(len(y), n_splits, seed)
+    data_hash = dataset_hash(X, y, n_splits, seed)
+
+    tasks = [
+        (model_name, params_key(params), fold)
+        for model_name in models
+        for params in ParameterGrid(grids.get(model_name, MODELS[model_name][2]))
+        for fold in range(n_splits)
+    ]
+
+    cache = ScoreCache(cache_file) if cache_file else None
+    model_names = {model_key(model_name): model_name for model_name in models}
+    scores = {
+        (model_names[model], key, fold): score
+        for (model, key, fold), score in cache.scores(data_hash).items() if model in model_names
+    } if cache else {}
+    pending = [task for task in tasks if task not in scores]
+    print(f"Задач: {len(tasks)}, из кэша: {len(tasks) - len(pending)}, к расчету: {len(pending)}")
+
+    start = perf_counter()
+    if pending:
+        if workers == 1:
+            _init_worker(X, y, folds)
+            results = [_run_task(task) for task in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(X, y, folds)) as executor:
+                results = list(executor.map(_run_task, pending))
+        scores.update({result[:3]: result[3:] for result in results})
+        if cache:
+            cache.save(data_hash, [(model_key(result[0]), *result[1:]) for result in results])
+    if cache:
+        cache.close()
+    print(f"Время расчета: {perf_counter() - start:.2f} с")
+
+    rows = {}
+    for model_name, key, fold in tasks:
+        rows.setdefault((model_name, key), []).append(scores[(model_name, key, fold)])
+    result = pd.DataFrame([
+        {
+            'model': model_name,
+            'params': key,
+            'mae': float(np.mean([mae for mae, _ in values])),
+            'mae_std': float(np.std([mae for mae, _ in values])),
+            'fit_seconds': float(np.sum([fit for _, fit in values])),
+        }
+        for (model_name, key), values in rows.items()
+    ])
+    return result.sort_values('mae', ignore_index=True)
+
+
+def best_per_model(results: pd.DataFrame) -> pd.DataFrame:
+    """Лучшие параметры каждой модели"""
+    return results.loc[results.groupby('model')['mae'].idxmin()].sort_values('mae', ignore_index=True)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Сравнение моделей зарплаты с кэшированием оценок')
+    arg_parser.add_argument('--csv', help='CSV файл парсера (иначе вакансии берутся из базы данных)')
+    arg_parser.add_argument('--specialization', help='специальность в базе данных')
+    arg_parser.add_argument('--db', default=DB_FILE, help='файл базы данных')
+    arg_parser.add_argument('--models', nargs='+', choices=list(MODELS), help='модели для сравнения')
+    arg_parser.add_argument('--grids', help='JSON файл с сетками параметров (имя модели -> сетка)')
+    arg_parser.add_argument('--folds', type=int, default=5)
+    arg_parser.add_argument('--workers', type=int, help='количество процессов')
+    arg_parser.add_argument('--no-cache', action='store_true', help='не использовать кэш оценок')
+    args = arg_parser.parse_args()
+
+    if not args.csv and not args.specialization:
+        arg_parser.error('укажите --csv или --specialization')
+
+    df = read_vacancies_csv(args.csv) if args.csv else read_vacancies_db(args.specialization, args.db)
+    known = df[df[TARGET_COLUMN].notna()]
+    grids = None
+    if args.grids:
+        with open(args.grids, encoding='utf-8') as f:
+            grids = json.load(f)
+
+    results = compare_models(
+        build_features(known, skill_columns(df)), known[TARGET_COLUMN].to_numpy(dtype=np.float64),
+        models=args.models, grids=grids, n_splits=args.folds, workers=args.workers,
+        cache_file=None if args.no_cache else CACHE_FILE
+    )
+    print(best_per_model(results).to_string())
+
+
+if __name__ == '__main__':
+    main()
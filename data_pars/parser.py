@@ -1,21 +1,37 @@
 import requests
 import csv
+from collections import Counter
+
+from hh_client import HH_CLIENT
+from parser_class import VacancyParser
+from skill_matrix import build_id_matrix, save_skill_matrix
+from skill_registry import SkillRegistry
 
 def get_vacancies(params):
-    vac = requests.get('https://api.hh.ru/vacancies', params=params)
     try:
-        return vac.json()
-    except Exception as e:
-        print('Error', vac.status_code)
+        return HH_CLIENT.get_vacancies(params)
+    except requests.exceptions.RequestException as e:
+        print('Error', e)
 
 
 def get_vacance(id):
-    url = f'https://api.hh.ru/vacancies/{id}'
-    resp = requests.get(url)
     try:
-        return resp.json()
-    except Exception as e:
-        print('Error', vac.status_code)
+        return HH_CLIENT.get_vacancy(id)
+    except requests.exceptions.RequestException as e:
+        print('Error', e)
+
+
+def add_vacancy(vacancy, area):
+    # Синонимы навыков сводятся к одному id
+    skill_ids = registry.ids((skill['name'] for skill in vacancy.get('key_skills', [])), intern=True)
+    vac_data = {
+        'url': vacancy.get('alternate_url'),
+        'name': vacancy.get('name'),
+        'area': area,
+        'skills': skill_ids
+    }
+    pars_vacancies.append(vac_data)
+    skill_counts.update(skill_ids)
 
 
 text = input('Введите название вакансии: ')
@@ -29,7 +45,10 @@ params = {
 first_page = get_vacancies(params)
 pages = first_page.get('pages')
 
-set_skills = {}
+# Технологии парсера - только канонические названия; ключевые слова поиска по тексту
+# объединяют разные навыки одной группы и синонимами не считаются
+registry = SkillRegistry(VacancyParser.all_skills())
+skill_counts = Counter()
 pars_vacancies = list()
 
 while params['page'] <= pages:
@@ -40,35 +59,39 @@ while params['page'] <= pages:
         cur_vac_by_id = get_vacance(vac.get('id'))
         if not cur_vac_by_id:
             continue
-        key_skills = cur_vac_by_id.get('key_skills', [])
-        vac_data = {
-            'url': cur_vac_by_id.get('alternate_url'),
-            'name': cur_vac_by_id.get('name'),
-            'area': params['area'],
-            'skills': [skill['name'] for skill in key_skills]
-        }
-        pars_vacancies.append(vac_data)
-        for skill in key_skills:
-            if skill['name'].upper() in set_skills:
-                set_skills[skill['name'].upper()] += 1
-            else:
-                set_skills[skill['name'].upper()] = 1
+        add_vacancy(cur_vac_by_id, params['area'])
     params['page'] += 1
 
-filtered_skills = {skill: count for skill, count in set_skills.items() if count > 1}
+for cur_vac_by_id in HH_CLIENT.retry_dead_letter():
+    add_vacancy(cur_vac_by_id, params['area'])
+
+# Колонки - навыки, встретившиеся больше одного раза: технологии парсера, затем в порядке появления
+filtered_skills = sorted(skill_id for skill_id, count in skill_counts.items() if count > 1)
+columns = {skill_id: i for i, skill_id in enumerate(filtered_skills)}
+vacancy_columns = [[columns[skill_id] for skill_id in vacancy['skills'] if skill_id in columns]
+                   for vacancy in pars_vacancies]
 
 table = []
-for vacancy in pars_vacancies:
-    row = [vacancy['url'], vacancy['name'], vacancy['area']]
-    for skill in filtered_skills:
-        row.append(1 if skill in vacancy['skills'] else 0)
-    table.append(row)
-    
-headers = ['URL', 'Name', 'Area'] + list(filtered_skills.keys())
+for vacancy, skill_columns in zip(pars_vacancies, vacancy_columns):
+    flags = [0] * len(filtered_skills)
+    for column in skill_columns:
+        flags[column] = 1
+    table.append([vacancy['url'], vacancy['name'], vacancy['area']] + flags)
+
+skill_names = [registry.name(skill_id) for skill_id in filtered_skills]
+headers = ['URL', 'Name', 'Area'] + skill_names
 
 with open('data.csv', 'w', newline='', encoding='utf-8') as csvfile:
     writer = csv.writer(csvfile)
     writer.writerow(headers)
     writer.writerows(table)
 
+# Упакованная матрица навыков для быстрой загрузки в анализе
+save_skill_matrix(
+    'data',
+    build_id_matrix(vacancy_columns, len(filtered_skills)),
+    skill_names,
+    [vacancy['url'] for vacancy in pars_vacancies]
+)
+
 print('Данные записаны в файл')
@@ -1,14 +1,39 @@
 import requests
 import csv
-import re
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from checkpoint import CrawlCheckpoint
+from columnar import records_to_table, write_columnar
+from currency import salary_to_rub
+from db import DB_FILE
+from fingerprint import vacancy_hash
+from hh_client import HH_CLIENT, FetchRegistry
+from metrics import METRICS
+from response_cache import CacheEntry
+from rate_limiter import TokenBucket
+from skill_matcher import SkillMatcher
+from skill_matrix import PARSER_META_COLUMNS, build_id_matrix, save_skill_matrix
+from skill_registry import SkillRegistry
 
 
 class VacancyParser:
     """Класс для парсинга вакансий с hh.ru с учетом специализации"""
 
+    # hh.ru отдает не более 20 страниц по 100 вакансий на один запрос
+    MAX_PAGES = 20
+    # Начальный период, наибольшее число его удвоений и минимальное окно дат при разбиении больших запросов
+    SHARD_PERIOD_DAYS = 30
+    MAX_PERIOD_DOUBLINGS = 6
+    MIN_SHARD_WINDOW = timedelta(hours=1)
+    # Размер очереди записей между потоками окон и потребителем
+    SHARD_QUEUE_SIZE = 1000
+
     # Базовые ключевые слова, общие для всех специальностей
     BASE_KEYWORDS = {
         'GIT': ['git', 'гит'],
@@ -67,64 +92,93 @@ class VacancyParser:
         }
     }
 
-    def __init__(self, search_query: str, specialization: str, area: int = 1):
+    def __init__(self, search_query: str, specialization: str, area: int = 1,
+                 workers: int = 1, rate_limit: float = 2.0,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 fetch_registry: Optional[FetchRegistry] = None,
+                 db_file: str = DB_FILE):
         """
         Инициализация парсера
         :param search_query: Строка поиска (название вакансии)
         :param specialization: Специальность (аналитик, фронтенд, бэкенд, кибербезопасность)
         :param area: ID региона (1 - Москва)
+        :param workers: Количество одновременных запросов деталей вакансий
+        :param rate_limit: Общий лимит запросов в секунду для параллельного режима
+        :param rate_limiter: Общий ограничитель нескольких парсеров (вместо собственного rate_limit)
+        :param fetch_registry: Общий реестр загрузки деталей для дедупликации между парсерами
+        :param db_file: База данных для контрольных точек обхода и метрик
         """
         self.search_query = search_query
         self.specialization = specialization.lower()
         self.area = area
+        self.workers = max(1, workers)
+        self.rate_limiter = rate_limiter or TokenBucket(rate_limit, capacity=self.workers)
+        self.fetch_registry = fetch_registry
+        self.db_file = db_file
+        # Общий лимит или реестр (несколько парсеров одновременно): запросы идут через лимит и при workers=1
+        self.shared = rate_limiter is not None or fetch_registry is not None
         self.vacancies_data = []
         self.total_pages = 0
         self.total_vacancies = 0
+        self.throughput = 0.0
+        # ID вакансий последнего обхода, содержимое которых не изменилось (режим refresh)
+        self.unchanged_ids = set()
         
+        # Формируем итоговый словарь ключевых слов для поиска
+        self.tech_keywords = self.get_tech_keywords(self.specialization)
+        self.skill_matcher = SkillMatcher(self.tech_keywords)
+        # id технологий совпадают с номерами колонок навыков в get_headers
+        self.skill_registry = SkillRegistry(self.tech_keywords.keys())
+
+    @classmethod
+    def get_tech_keywords(cls, specialization: str) -> Dict[str, List[str]]:
+        """Словарь ключевых слов для поиска с учетом специализации"""
         # Проверяем, что указана корректная специализация
-        if self.specialization not in self.SPECIALIZATION_KEYWORDS:
+        if specialization not in cls.SPECIALIZATION_KEYWORDS:
             raise ValueError(
-                f"Неподдерживаемая специализация. Допустимые значения: {', '.join(self.SPECIALIZATION_KEYWORDS.keys())}"
+                f"Неподдерживаемая специализация. Допустимые значения: {', '.join(cls.SPECIALIZATION_KEYWORDS.keys())}"
             )
+        return {**cls.BASE_KEYWORDS, **cls.SPECIALIZATION_KEYWORDS[specialization]}
 
-        # Формируем итоговый словарь ключевых слов для поиска
-        self.tech_keywords = {**self.BASE_KEYWORDS, **self.SPECIALIZATION_KEYWORDS[self.specialization]}
+    @classmethod
+    def all_skills(cls) -> List[str]:
+        """Объединенный список технологий всех специальностей (общая схема колоночных файлов)"""
+        skills = dict.fromkeys(cls.BASE_KEYWORDS)
+        for keywords in cls.SPECIALIZATION_KEYWORDS.values():
+            skills.update(dict.fromkeys(keywords))
+        return list(skills)
 
     def extract_tech_skills(self, text: str) -> List[str]:
         """Извлечение технологий из текста с учетом синонимов"""
-        if not text:
-            return []
-            
-        text = text.lower()
-        found_skills = set()
-        
-        for tech, keywords in self.tech_keywords.items():
-            for keyword in keywords:
-                if re.search(rf'\b{re.escape(keyword)}\b', text, flags=re.IGNORECASE):
-                    found_skills.add(tech)
-                    break
-        return list(found_skills)
+        return self.skill_matcher.extract(text)
 
     @staticmethod
     def get_vacancies(params: Dict) -> Optional[Dict]:
         """Получение списка вакансий с обработкой ошибок"""
         try:
-            response = requests.get('https://api.hh.ru/vacancies', params=params)
-            response.raise_for_status()
-            return response.json()
+            return HH_CLIENT.get_vacancies(params)
         except requests.exceptions.RequestException as e:
             print(f"Ошибка запроса: {e}")
             return None
 
     @staticmethod
-    def get_vacancy_details(vacancy_id: str) -> Optional[Dict]:
-        """Получение деталей вакансии с задержкой"""
+    def get_vacancy_details(vacancy_id: str, delay: float = 0.5, entry: Optional[CacheEntry] = None,
+                            lookup: bool = True) -> Optional[Dict]:
+        """
+        Получение деталей вакансии с задержкой (свежие данные берутся из кэша)
+        :param entry: Запись кэша, если кэш уже проверен вызывающим кодом
+        :param lookup: Искать ли вакансию в кэше (False - использовать entry)
+        """
+        if lookup:
+            entry = HH_CLIENT.cache_entry(vacancy_id)
+        if entry and entry.fresh:
+            return entry.body
         try:
-            url = f'https://api.hh.ru/vacancies/{vacancy_id}'
-            response = requests.get(url)
-            response.raise_for_status()
-            sleep(0.5)  # Соблюдение лимитов API
-            return response.json()
+            vacancy = HH_CLIENT.get_vacancy(vacancy_id, entry, lookup=False)
+            if delay:
+                with METRICS.timer('sleep'):
+                    sleep(delay)  # Соблюдение лимитов API
+            return vacancy
         except requests.exceptions.RequestException as e:
             print(f"Ошибка получения вакансии {vacancy_id}: {e}")
             return None
@@ -146,9 +200,282 @@ class VacancyParser:
         
         return ' '.join(parts) if parts else None
 
-    def parse_vacancies(self) -> bool:
-        """Основной метод для парсинга вакансий"""
+    @staticmethod
+    def parse_salary(salary_data: Optional[Dict]) -> Dict:
+        """Структурированные данные о зарплате с серединой вилки в рублях"""
+        salary_data = salary_data or {}
+        salary_from = salary_data.get('from')
+        salary_to = salary_data.get('to')
+        currency = salary_data.get('currency')
+        gross = salary_data.get('gross')
+
+        return {
+            'salary_from': salary_from,
+            'salary_to': salary_to,
+            'currency': currency.upper() if currency else None,
+            'gross': gross,
+            'salary_rub': salary_to_rub(salary_from, salary_to, currency),
+        }
+
+    def _get_page(self, params: Dict) -> Optional[Dict]:
+        """Получение страницы списка; в параллельном и общем режимах запрос тоже расходует лимит"""
+        if self.workers > 1 or self.shared:
+            with METRICS.timer('rate_limit_wait'):
+                self.rate_limiter.acquire()
+        return self.get_vacancies(params)
+
+    def _fetch_limited(self, vacancy_id: str) -> Optional[Dict]:
+        """Получение деталей вакансии с учетом общего реестра загрузок"""
+        if self.fetch_registry:
+            return self.fetch_registry.fetch(vacancy_id, self._fetch_budgeted)
+        return self._fetch_budgeted(vacancy_id)
+
+    def _fetch_budgeted(self, vacancy_id: str) -> Optional[Dict]:
+        """Получение деталей вакансии под общим ограничителем частоты"""
+        entry = HH_CLIENT.cache_entry(vacancy_id)
+        if entry and entry.fresh:
+            return entry.body
+        with METRICS.timer('rate_limit_wait'):
+            self.rate_limiter.acquire()
+        return self.get_vacancy_details(vacancy_id, delay=0, entry=entry, lookup=False)
+
+    def fetch_details(self, vacancy_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        Получение деталей для списка вакансий
+        :param vacancy_ids: Список ID вакансий
+        :return: Детали вакансий в том же порядке (None для неудачных запросов)
+        """
+        if self.workers == 1:
+            if self.shared:
+                return [self._fetch_limited(vacancy_id) for vacancy_id in vacancy_ids]
+            return [self.get_vacancy_details(vacancy_id) for vacancy_id in vacancy_ids]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self._fetch_limited, vacancy_ids))
+
+    def build_record(self, vacancy: Dict, previous: Optional[Dict] = None) -> Dict:
+        """
+        Формирование записи о вакансии из ответа API
+        :param vacancy: Детали вакансии
+        :param previous: Сохраненная ранее запись; если содержимое не изменилось, она возвращается без обработки
+        """
+        content_hash = vacancy_hash(vacancy)
+        if previous and previous.get('content_hash') == content_hash:
+            METRICS.count('unchanged')
+            return previous
+
+        # Извлечение данных
+        with METRICS.timer('extract'):
+            skills = self.extract_tech_skills(vacancy.get('description', ''))
+
+        # Обработка дополнительных полей
+        employer = vacancy.get('employer', {})
+        salary = self.process_salary(vacancy.get('salary'))
+        experience = vacancy.get('experience', {}).get('name', 'не указан')
+        is_remote = 'удален' in vacancy.get('schedule', {}).get('name', '').lower()
+
+        return {
+            'id': vacancy.get('id', ''),
+            'name': vacancy.get('name', ''),
+            'url': vacancy.get('alternate_url', ''),
+            'company': employer.get('name', '') if employer else '',
+            'salary': salary,
+            **self.parse_salary(vacancy.get('salary')),
+            'experience': experience,
+            'remote': is_remote,
+            'skills': skills,
+            'content_hash': content_hash
+        }
+
+    def _process_vacancy(self, vacancy: Dict, previous: Optional[Dict], records: List[Dict]) -> Dict:
+        """
+        Запись о вакансии с учетом сохраненной ранее
+        :param vacancy: Детали вакансии
+        :param previous: Сохраненная ранее запись или None
+        :param records: Список для новых и изменившихся записей (их нужно сохранить в контрольных точках)
+        """
+        record = self.build_record(vacancy, previous)
+        # Сохраняются только новые и изменившиеся вакансии
+        if record is previous:
+            self.unchanged_ids.add(record['id'])
+        else:
+            records.append(record)
+        return record
+
+    @property
+    def crawl_key(self) -> str:
+        """Ключ обхода для контрольных точек"""
+        return f"{self.search_query}|{self.specialization}|{self.area}"
+
+    def _iter_pages(self, params: Dict, total_pages: int, checkpoint: Optional[CrawlCheckpoint],
+                    completed_pages: Set[int], only_new: bool, failed_ids: List[str],
+                    refresh: bool = False, first_page: Optional[Dict] = None,
+                    save_pages: bool = True) -> Iterator[Dict]:
+        """
+        Обработка страниц одного поискового запроса
+        :param params: Параметры запроса
+        :param total_pages: Количество страниц в выдаче
+        :param checkpoint: Контрольные точки (None - без сохранения прогресса)
+        :param completed_pages: Страницы, уже обработанные ранее
+        :param only_new: Пропускать вакансии, сохраненные в прошлых обходах
+        :param failed_ids: Список, в который добавляются ID не полученных вакансий
+        :param refresh: Заново получать сохраненные вакансии и обрабатывать только изменившиеся
+        :param first_page: Уже полученная первая страница выдачи (повторно не запрашивается)
+        :param save_pages: Отмечать страницы обработанными в контрольных точках (номера страниц
+            окон по дате не совпадают между запусками, для них сохраняются только вакансии)
+        """
+        params = dict(params)
+        for page in range(min(total_pages, self.MAX_PAGES)):
+            if page in completed_pages:
+                continue
+            params['page'] = page
+            print(f"Обработка страницы {page+1}/{total_pages}...")
+            
+            vacancies = first_page if page == 0 and first_page else self._get_page(params)
+            if not vacancies or 'items' not in vacancies:
+                continue
+
+            vacancy_ids = [item['id'] for item in vacancies['items']]
+            stored = checkpoint.stored_records(vacancy_ids) if checkpoint else {}
+            if only_new:
+                vacancy_ids = [vacancy_id for vacancy_id in vacancy_ids if vacancy_id not in stored]
+            elif not refresh:
+                # Вакансии, сохраненные в прошлых обходах, повторно не запрашиваются
+                for vacancy_id in vacancy_ids:
+                    if vacancy_id in stored:
+                        yield stored[vacancy_id]
+
+            records = []
+            to_fetch = vacancy_ids if refresh else [vacancy_id for vacancy_id in vacancy_ids if vacancy_id not in stored]
+            for vacancy_id, vacancy in zip(to_fetch, self.fetch_details(to_fetch)):
+                if not vacancy:
+                    failed_ids.append(vacancy_id)
+                    continue
+
+                yield self._process_vacancy(vacancy, stored.get(vacancy_id), records)
+
+            if checkpoint:
+                checkpoint.save_page(page if save_pages else None, records, vacancy_ids)
+
+    def oldest_date(self, params: Dict, date_to: datetime) -> datetime:
+        """
+        Нижняя граница дат публикации выдачи: период удваивается, пока раньше его начала
+        находятся вакансии (не более MAX_PERIOD_DOUBLINGS раз)
+        :param params: Параметры исходного запроса
+        :param date_to: Верхняя граница дат
+        """
+        period = timedelta(days=self.SHARD_PERIOD_DAYS)
+        for _ in range(self.MAX_PERIOD_DOUBLINGS):
+            older = self._get_page({**params, 'page': 0, 'per_page': 1,
+                                    'date_to': (date_to - period).isoformat()})
+            if not older or not older.get('found'):
+                break
+            period *= 2
+        return date_to - period
+
+    def split_shards(self, params: Dict) -> List[Tuple[Dict, Dict]]:
+        """
+        Разбиение запроса на непересекающиеся окна по дате публикации,
+        каждое из которых укладывается в ограничение выдачи hh.ru
+        :param params: Параметры исходного запроса
+        :return: Список (параметры окна, первая страница выдачи окна)
+        """
+        date_to = datetime.now().replace(microsecond=0)
+        if 'date_from' in params:
+            date_from = datetime.fromisoformat(params['date_from'])
+        else:
+            date_from = self.oldest_date(params, date_to)
+
+        windows = [(date_from, date_to)]
+        shards = []
+        while windows:
+            window_from, window_to = windows.pop()
+            shard = {
+                **params,
+                'page': 0,
+                'date_from': window_from.isoformat(),
+                'date_to': window_to.isoformat(),
+            }
+            result = self._get_page(shard)
+            if not result:
+                continue
+
+            found = result.get('found', 0)
+            if found > self.MAX_PAGES * params['per_page'] and window_to - window_from > self.MIN_SHARD_WINDOW:
+                middle = (window_from + (window_to - window_from) / 2).replace(microsecond=0)
+                windows += [(middle, window_to), (window_from, middle)]
+            elif found:
+                shards.append((shard, result))
+        return shards
+
+    def _iter_shards(self, shards: List[Tuple[Dict, Dict]], checkpoint: Optional[CrawlCheckpoint],
+                     only_new: bool, failed_ids: List[str], refresh: bool) -> Iterator[Dict]:
+        """
+        Параллельная обработка окон по дате публикации (не более workers окон одновременно)
+        Записи всех окон выдаются через общую очередь по мере обработки
+        :param shards: Окна split_shards: (параметры окна, первая страница выдачи окна)
+        :param checkpoint: Контрольные точки (None - без сохранения прогресса)
+        :param only_new: Пропускать вакансии, сохраненные в прошлых обходах
+        :param failed_ids: Список, в который добавляются ID не полученных вакансий
+        :param refresh: Заново получать сохраненные вакансии и обрабатывать только изменившиеся
+        """
+        records = queue.Queue(maxsize=self.SHARD_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> None:
+            # Потребитель мог прекратить чтение: поток окна не должен блокироваться навсегда
+            while not stop.is_set():
+                try:
+                    records.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def crawl(shard_params: Dict, first_page: Dict) -> None:
+            try:
+                for record in self._iter_pages(shard_params, first_page.get('pages', 0), checkpoint, set(),
+                                               only_new, failed_ids, refresh, first_page=first_page,
+                                               save_pages=False):
+                    if stop.is_set():
+                        return
+                    put(record)
+            finally:
+                put(done)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(shards)) or 1) as executor:
+            futures = [executor.submit(crawl, shard_params, first_page) for shard_params, first_page in shards]
+            try:
+                remaining = len(futures)
+                while remaining:
+                    item = records.get()
+                    if item is done:
+                        remaining -= 1
+                    else:
+                        yield item
+            finally:
+                stop.set()
+            # Ошибка в потоке окна передается вызывающему коду
+            for future in futures:
+                future.result()
+
+    def iter_vacancies(self, resume: bool = False, only_new: bool = False,
+                       shard: bool = False, refresh: bool = False) -> Iterator[Dict]:
+        """
+        Потоковый парсинг вакансий: записи выдаются по мере обработки
+        :param resume: Продолжить прерванный обход с последней контрольной точки
+        :param only_new: Обрабатывать только вакансии, появившиеся после прошлого обхода
+        :param shard: Если вакансий больше, чем отдает hh.ru (20 страниц), разбить поиск
+            на окна по дате публикации и обработать их параллельно (в контрольных точках
+            сохраняются вакансии окон, но не номера их страниц)
+        :param refresh: Заново получить все вакансии, но извлекать навыки и сохранять только
+            те, у которых изменился хэш содержимого
+        :raises ConnectionError: Если не удалось получить первую страницу поиска
+        """
         start_time = datetime.now()
+        checkpoint = CrawlCheckpoint(self.crawl_key, self.db_file) if resume or only_new or refresh else None
+        count = 0
+        self.unchanged_ids = set()
         
         # Параметры запроса
         params = {
@@ -158,58 +485,166 @@ class VacancyParser:
             'per_page': 100,
         }
 
+        if only_new:
+            since = checkpoint.last_finished()
+            if since:
+                params['date_from'] = since
+                print(f"Только новые вакансии с {since}")
+
         # Первичный запрос для получения информации о страницах
-        first_page = self.get_vacancies(params)
+        first_page = self._get_page(params)
         if not first_page:
-            print("Не удалось получить данные с сервера")
-            return False
+            raise ConnectionError("Не удалось получить данные с сервера")
 
         self.total_pages = first_page.get('pages', 0)
         self.total_vacancies = first_page.get('found', 0)
         print(f"Найдено вакансий: {self.total_vacancies}")
         print(f"Всего страниц для обработки: {self.total_pages}")
 
-        # Обработка всех страниц
-        for page in range(min(self.total_pages, 20)):  # Ограничиваем 20 страницами
-            params['page'] = page
-            print(f"Обработка страницы {page+1}/{self.total_pages}...")
-            
-            vacancies = self.get_vacancies(params)
-            if not vacancies or 'items' not in vacancies:
+        completed_pages = set()
+        failed_ids = []
+        seen = set()
+        if checkpoint and resume:
+            completed_pages = checkpoint.completed_pages()
+            if completed_pages:
+                print(f"Возобновление: пропущено страниц {len(completed_pages)}")
+            for record in checkpoint.page_records():
+                seen.add(record['id'])
+                count += 1
+                yield record
+
+        limit = self.MAX_PAGES * params['per_page']
+        if shard and self.total_vacancies > limit:
+            shards = self.split_shards(params)
+            covered = sum(min(result.get('found', 0), limit) for _, result in shards)
+            print(f"Поиск разбит на {len(shards)} окон по дате публикации, "
+                  f"доступно вакансий: {covered} из {self.total_vacancies}")
+            if covered < self.total_vacancies:
+                print("Внимание: часть вакансий не попала в окна по дате публикации")
+            records = self._iter_shards(shards, checkpoint, only_new, failed_ids, refresh)
+        else:
+            records = self._iter_pages(params, self.total_pages, checkpoint, completed_pages,
+                                       only_new, failed_ids, refresh, first_page=first_page)
+
+        # Окна по дате пересекаются на границах, повторы отбрасываются по ID
+        for record in records:
+            if record['id'] not in seen:
+                seen.add(record['id'])
+                count += 1
+                yield record
+
+        # Повторная загрузка вакансий, не полученных с первого раза: та же обработка и отбор повторов,
+        # что и для основного потока
+        retried = HH_CLIENT.retry_dead_letter(failed_ids, rate_limiter=self.rate_limiter)
+        stored = checkpoint.stored_records([vacancy['id'] for vacancy in retried]) if checkpoint else {}
+        records = []
+        for vacancy in retried:
+            if vacancy['id'] in seen:
                 continue
-                
-            for item in vacancies['items']:
-                vacancy = self.get_vacancy_details(item['id'])
-                if not vacancy:
-                    continue
+            seen.add(vacancy['id'])
+            count += 1
+            yield self._process_vacancy(vacancy, stored.get(vacancy['id']), records)
 
-                # Извлечение данных
-                skills = self.extract_tech_skills(vacancy.get('description', ''))
-                
-                # Обработка дополнительных полей
-                employer = vacancy.get('employer', {})
-                salary = self.process_salary(vacancy.get('salary'))
-                experience = vacancy.get('experience', {}).get('name', 'не указан')
-                is_remote = 'удален' in vacancy.get('schedule', {}).get('name', '').lower()
-
-                # Сохранение данных
-                self.vacancies_data.append({
-                    'name': vacancy.get('name', ''),
-                    'url': vacancy.get('alternate_url', ''),
-                    'company': employer.get('name', '') if employer else '',
-                    'salary': salary,
-                    'experience': experience,
-                    'remote': is_remote,
-                    'skills': skills
-                })
+        if checkpoint:
+            checkpoint.save_page(None, records, [])
+            checkpoint.finish(start_time)
+            checkpoint.close()
 
         total_time = datetime.now() - start_time
-        print(f"\nОбработано вакансий: {len(self.vacancies_data)}")
+        seconds = total_time.total_seconds()
+        self.throughput = count / seconds if seconds else 0.0
+        METRICS.count('vacancies', count)
+        METRICS.count('failed', len(failed_ids) - len(retried))
+        print(f"\nОбработано вакансий: {count}")
+        if refresh:
+            print(f"Без изменений: {len(self.unchanged_ids)}")
         print(f"Общее время выполнения: {total_time}")
+        print(f"Скорость обработки: {self.throughput:.2f} вакансий/сек")
+
+    def parse_vacancies(self, resume: bool = False, only_new: bool = False, shard: bool = False,
+                        refresh: bool = False) -> bool:
+        """
+        Основной метод для парсинга вакансий
+        :param resume: Продолжить прерванный обход с последней контрольной точки
+        :param only_new: Обрабатывать только вакансии, появившиеся после прошлого обхода
+        :param shard: Разбить поиск на окна по дате, если выдача больше 20 страниц
+        :param refresh: Обновить сохраненные вакансии, обрабатывая только изменившиеся
+        """
+        try:
+            self.vacancies_data.extend(self.iter_vacancies(resume=resume, only_new=only_new,
+                                                           shard=shard, refresh=refresh))
+        except ConnectionError as e:
+            print(e)
+            return False
         return True
 
-    def save_to_csv(self, filename: str = None) -> bool:
-        """Сохранение данных в CSV-файл"""
+    def stream_to(self, sinks: List, resume: bool = False, only_new: bool = False,
+                  shard: bool = False, refresh: bool = False) -> int:
+        """
+        Потоковая запись вакансий в приемники без накопления в памяти
+        :param sinks: Приемники данных (CSVSink, SQLiteSink)
+        :param resume: Продолжить прерванный обход с последней контрольной точки
+        :param only_new: Обрабатывать только вакансии, появившиеся после прошлого обхода
+        :param shard: Разбить поиск на окна по дате, если выдача больше 20 страниц
+        :param refresh: Обновить сохраненные вакансии; в приемники записываются только новые и изменившиеся
+        :return: Количество записанных вакансий
+        """
+        headers = self.get_headers()
+        opened = []
+        count = 0
+        try:
+            for sink in sinks:
+                sink.open(headers)
+                opened.append(sink)
+
+            for record in self.iter_vacancies(resume=resume, only_new=only_new, shard=shard, refresh=refresh):
+                # Неизменившиеся вакансии уже сохранены в прошлых обходах
+                if record['id'] in self.unchanged_ids:
+                    continue
+                row = self.to_row(record)
+                for sink in sinks:
+                    sink.write(row)
+                count += 1
+        except ConnectionError as e:
+            print(e)
+        finally:
+            # Закрываются только открытые приемники
+            for sink in opened:
+                sink.close()
+        return count
+
+    def get_headers(self) -> List[str]:
+        """Заголовки таблицы вакансий"""
+        return PARSER_META_COLUMNS + list(self.tech_keywords.keys())
+
+    def to_row(self, vac: Dict) -> List:
+        """Преобразование записи о вакансии в строку таблицы"""
+        row = [
+            vac['name'],
+            vac['url'],
+            vac['company'],
+            vac['salary'] or 'не указана',
+            vac['experience'],
+            'Да' if vac['remote'] else 'Нет',
+            vac.get('salary_from'),
+            vac.get('salary_to'),
+            vac.get('currency'),
+            {True: 'Да', False: 'Нет'}.get(vac.get('gross')),
+            vac.get('salary_rub'),
+            vac.get('content_hash')
+        ]
+        flags = [0] * len(self.tech_keywords)
+        for skill_id in self.skill_registry.ids(vac['skills']):
+            if skill_id < len(flags):
+                flags[skill_id] = 1
+        return row + flags
+
+    def save_to_csv(self, filename: str = None, with_matrix: bool = True) -> bool:
+        """
+        Сохранение данных в CSV-файл
+        :param filename: Имя файла (по умолчанию <специализация>_vacancies.csv)
+        :param with_matrix: Дополнительно сохранить упакованную матрицу навыков (skill_matrix)
+        """
         if not self.vacancies_data:
             print("Нет данных для сохранения")
             return False
@@ -218,29 +653,26 @@ class VacancyParser:
             filename = f"{self.specialization}_vacancies.csv"
 
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
+            with open(filename, 'w', newline='', encoding='utf-8') as f, METRICS.timer('sink_csv'):
                 writer = csv.writer(f)
-                
-                # Формирование заголовков
-                headers = [
-                    'Должность', 'Ссылка', 'Компания',
-                    'Зарплата', 'Опыт', 'Удаленная работа'
-                ] + list(self.tech_keywords.keys())
-                
-                writer.writerow(headers)
+                writer.writerow(self.get_headers())
                 
                 # Запись данных
                 for vac in self.vacancies_data:
-                    row = [
-                        vac['name'],
-                        vac['url'],
-                        vac['company'],
-                        vac['salary'] or 'не указана',
-                        vac['experience'],
-                        'Да' if vac['remote'] else 'Нет'
-                    ]
-                    row += [1 if tech in vac['skills'] else 0 for tech in self.tech_keywords.keys()]
-                    writer.writerow(row)
+                    writer.writerow(self.to_row(vac))
+
+            if with_matrix:
+                skills = list(self.tech_keywords.keys())
+                save_skill_matrix(
+                    os.path.splitext(filename)[0],
+                    build_id_matrix(
+                        ([skill_id for skill_id in self.skill_registry.ids(vac['skills']) if skill_id < len(skills)]
+                         for vac in self.vacancies_data),
+                        len(skills)
+                    ),
+                    skills,
+                    [vac['url'] for vac in self.vacancies_data]
+                )
 
             print(f"Отчет сохранен в {filename}")
             return True
@@ -248,6 +680,45 @@ class VacancyParser:
             print(f"Ошибка при сохранении файла: {e}")
             return False
 
+    def save_columnar(self, filename: str = None) -> bool:
+        """
+        Сохранение данных в типизированный колоночный файл (Parquet или Arrow IPC)
+        Схема одинакова для всех специальностей; навыки чужих специальностей заполняются null
+        :param filename: Имя файла .parquet/.arrow (по умолчанию <специализация>_vacancies.parquet)
+        """
+        if not self.vacancies_data:
+            print("Нет данных для сохранения")
+            return False
+
+        if not filename:
+            filename = f"{self.specialization}_vacancies.parquet"
+
+        table = records_to_table(
+            ({**vac, 'specialization': self.specialization} for vac in self.vacancies_data),
+            self.all_skills(),
+            tracked_skills=set(self.tech_keywords)
+        )
+        write_columnar(table, filename)
+        print(f"Отчет сохранен в {filename}")
+        return True
+
+    def save_metrics(self, filename: str = None, to_db: bool = True) -> Dict:
+        """
+        Сохранение отчета о метриках запуска (время этапов, повторы, коды ответов)
+        :param filename: Имя JSON файла (по умолчанию <специализация>_metrics.json)
+        :param to_db: Дополнительно записать отчет в таблицы crawl_metrics базы данных
+        :return: Отчет о запуске
+        """
+        if not filename:
+            filename = f"{self.specialization}_metrics.json"
+
+        METRICS.print_summary()
+        report = METRICS.save_json(filename)
+        if to_db:
+            METRICS.save_to_db(self.crawl_key, self.db_file)
+        print(f"Метрики сохранены в {filename}")
+        return report
+
 
 if __name__ == '__main__':
     try:
@@ -258,5 +729,6 @@ if __name__ == '__main__':
         
         if parser.parse_vacancies():
             parser.save_to_csv()
+            parser.save_metrics()
     except ValueError as e:
         print(e)
\ No newline at end of file
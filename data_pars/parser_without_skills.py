@@ -1,9 +1,11 @@
 import requests
 import csv
-import re
 from time import sleep
 from datetime import datetime
 
+from hh_client import HH_CLIENT
+from skill_matcher import SkillMatcher
+
 # Словарь технологий и их синонимов
 TECH_KEYWORDS = {
     'PYTHON': ['python', 'питон', 'пайтон'],
@@ -29,36 +31,30 @@ TECH_KEYWORDS = {
     ]
 }
 
+# Матчер строится один раз для всего словаря технологий
+SKILL_MATCHER = SkillMatcher(TECH_KEYWORDS)
+
 def extract_tech_skills(text):
     """Извлечение технологий из текста с учетом синонимов"""
-    text = text.lower()
-    found_skills = set()
-    
-    for tech, keywords in TECH_KEYWORDS.items():
-        for keyword in keywords:
-            if re.search(rf'\b{re.escape(keyword)}\b', text, flags=re.IGNORECASE):
-                found_skills.add(tech)
-                break
-    return list(found_skills)
+    return SKILL_MATCHER.extract(text)
 
 def get_vacancies(params):
     """Получение списка вакансий с обработкой ошибок"""
     try:
-        response = requests.get('https://api.hh.ru/vacancies', params=params)
-        response.raise_for_status()
-        return response.json()
+        return HH_CLIENT.get_vacancies(params)
     except requests.exceptions.RequestException as e:
         print(f"Ошибка запроса: {e}")
         return None
 
 def get_vacancy_details(vacancy_id):
-    """Получение деталей вакансии с задержкой"""
+    """Получение деталей вакансии с задержкой (свежие данные берутся из кэша)"""
+    entry = HH_CLIENT.cache_entry(vacancy_id)
+    if entry and entry.fresh:
+        return entry.body
     try:
-        url = f'https://api.hh.ru/vacancies/{vacancy_id}'
-        response = requests.get(url)
-        response.raise_for_status()
+        vacancy = HH_CLIENT.get_vacancy(vacancy_id, entry, lookup=False)
         sleep(0.5)  # Соблюдение лимитов API
-        return response.json()
+        return vacancy
     except requests.exceptions.RequestException as e:
         print(f"Ошибка получения вакансии {vacancy_id}: {e}")
         return None
@@ -79,6 +75,27 @@ def process_salary(salary_data):
     
     return ' '.join(parts) if parts else None
 
+def build_record(vacancy):
+    """Формирование записи о вакансии из ответа API"""
+    # Извлечение данных
+    skills = extract_tech_skills(vacancy.get('description', ''))
+
+    # Обработка дополнительных полей
+    employer = vacancy.get('employer', {})
+    salary = process_salary(vacancy.get('salary'))
+    experience = vacancy.get('experience', {}).get('name', 'не указан')
+    is_remote = 'удален' in vacancy.get('schedule', {}).get('name', '').lower()
+
+    return {
+        'name': vacancy.get('name', ''),
+        'url': vacancy.get('alternate_url', ''),
+        'company': employer.get('name', '') if employer else '',
+        'salary': salary,
+        'experience': experience,
+        'remote': is_remote,
+        'skills': skills
+    }
+
 def main():
     start_time = datetime.now()
     search_query = input('Введите название вакансии: ')
@@ -117,25 +134,12 @@ def main():
             if not vacancy:
                 continue
 
-            # Извлечение данных
-            skills = extract_tech_skills(vacancy.get('description', ''))
-            
-            # Обработка дополнительных полей
-            employer = vacancy.get('employer', {})
-            salary = process_salary(vacancy.get('salary'))
-            experience = vacancy.get('experience', {}).get('name', 'не указан')
-            is_remote = 'удален' in vacancy.get('schedule', {}).get('name', '').lower()
-
             # Сохранение данных
-            vacancies_data.append({
-                'name': vacancy.get('name', ''),
-                'url': vacancy.get('alternate_url', ''),
-                'company': employer.get('name', '') if employer else '',
-                'salary': salary,
-                'experience': experience,
-                'remote': is_remote,
-                'skills': skills
-            })
+            vacancies_data.append(build_record(vacancy))
+
+    # Повторная загрузка вакансий, не полученных с первого раза
+    for vacancy in HH_CLIENT.retry_dead_letter():
+        vacancies_data.append(build_record(vacancy))
 
     # Сохранение в CSV
     if not vacancies_data:
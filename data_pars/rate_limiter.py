@@ -0,0 +1,40 @@
+import threading
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """Потокобезопасный ограничитель частоты запросов (token bucket)"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Инициализация ограничителя
+        :param rate: Количество запросов в секунду
+        :param capacity: Максимальное число запросов, которое можно сделать залпом
+        """
+        if rate <= 0:
+            raise ValueError("Частота запросов должна быть положительной")
+        if capacity < 1:
+            raise ValueError("Емкость должна быть не меньше 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Пополнение токенов пропорционально прошедшему времени"""
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Блокирующее получение одного токена"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            sleep(wait)
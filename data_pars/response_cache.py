@@ -0,0 +1,151 @@
+import atexit
+import json
+import os
+import sqlite3 as sql
+import threading
+from time import time
+from typing import Dict, NamedTuple, Optional
+
+from db import REPO_ROOT
+
+# Кэш хранится рядом с database.db в корне репозитория
+# Путь можно переопределить переменной окружения HH_CACHE_FILE (например, для бенчмарков)
+CACHE_FILE = os.environ.get('HH_CACHE_FILE', os.path.join(REPO_ROOT, 'vacancy_cache.db'))
+
+
+class CacheEntry(NamedTuple):
+    """Запись кэша ответа API"""
+    body: Dict
+    etag: Optional[str]
+    fresh: bool
+
+
+class ResponseCache:
+    """Персистентный LRU-кэш ответов API по ID вакансии в SQLite"""
+
+    EVICT_EVERY = 100
+    # Время обращения к записям пишется в файл не чаще раза в TOUCH_INTERVAL секунд
+    TOUCH_INTERVAL = 30.0
+
+    def __init__(self, db_file: str = CACHE_FILE, ttl: float = 24 * 3600, max_entries: int = 50000):
+        """
+        Инициализация кэша
+        :param db_file: Путь к файлу SQLite с кэшем
+        :param ttl: Время (сек), в течение которого запись считается свежей
+        :param max_entries: Максимальное число записей, лишние вытесняются по LRU
+        """
+        self.db_file = db_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._puts = 0
+        self._touched = {}
+        self._touched_at = time()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self) -> sql.Connection:
+        """
+        Соединение с файлом кэша; файл открывается при первом обращении, а не при импорте клиента
+        Обращения к соединению выполняются под self._lock
+        """
+        if self._conn is None:
+            self._conn = sql.connect(self.db_file, check_same_thread=False)
+            with self._conn:
+                self._conn.execute('''
+                    CREATE TABLE IF NOT EXISTS vacancy_cache (
+                        vacancy_id TEXT PRIMARY KEY,
+                        body TEXT NOT NULL,
+                        etag TEXT,
+                        fetched_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                ''')
+                self._conn.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_vacancy_cache_accessed ON vacancy_cache (accessed_at)'
+                )
+            # Отложенные времена обращения сохраняются при выходе, даже если кэш не закрыли явно
+            atexit.register(self.close)
+        return self._conn
+
+    def get(self, vacancy_id: str) -> Optional[CacheEntry]:
+        """
+        Получение записи из кэша
+        :param vacancy_id: ID вакансии
+        :return: Запись кэша или None, если вакансии нет в кэше
+        """
+        now = time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT body, etag, fetched_at FROM vacancy_cache WHERE vacancy_id = ?',
+                (vacancy_id,)
+            ).fetchone()
+            if not row:
+                return None
+            # Время обращения копится в памяти и записывается пачкой, а не UPDATE + commit на каждое попадание
+            self._touched[vacancy_id] = now
+            if now - self._touched_at >= self.TOUCH_INTERVAL:
+                with self.conn:
+                    self._flush_touched()
+
+        body, etag, fetched_at = row
+        return CacheEntry(json.loads(body), etag, now - fetched_at < self.ttl)
+
+    def put(self, vacancy_id: str, body: Dict, etag: Optional[str] = None) -> None:
+        """
+        Сохранение ответа в кэш с вытеснением давно неиспользуемых записей
+        :param vacancy_id: ID вакансии
+        :param body: Ответ API
+        :param etag: ETag ответа для условной перепроверки
+        """
+        now = time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO vacancy_cache VALUES (?, ?, ?, ?, ?)',
+                (vacancy_id, json.dumps(body, ensure_ascii=False), etag, now, now)
+            )
+            self._touched.pop(vacancy_id, None)
+            self._puts += 1
+            # Вытеснение выполняется пачками, чтобы не сканировать индекс на каждой записи
+            if self._puts % self.EVICT_EVERY == 0:
+                self._evict()
+
+    def _flush_touched(self) -> None:
+        """Запись накопленных времен обращения к записям"""
+        if self._touched:
+            self.conn.executemany(
+                'UPDATE vacancy_cache SET accessed_at = ? WHERE vacancy_id = ?',
+                [(accessed_at, vacancy_id) for vacancy_id, accessed_at in self._touched.items()]
+            )
+            self._touched = {}
+        self._touched_at = time()
+
+    def _evict(self) -> None:
+        """Удаление записей сверх max_entries, начиная с давно неиспользуемых"""
+        # Порядок LRU должен учитывать еще не записанные обращения
+        self._flush_touched()
+        self.conn.execute('''
+            DELETE FROM vacancy_cache WHERE vacancy_id IN (
+                SELECT vacancy_id FROM vacancy_cache
+                ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,))
+
+    def touch(self, vacancy_id: str) -> None:
+        """Продление срока свежести записи после успешной перепроверки (304)"""
+        now = time()
+        with self._lock, self.conn:
+            self._touched.pop(vacancy_id, None)
+            self.conn.execute(
+                'UPDATE vacancy_cache SET fetched_at = ?, accessed_at = ? WHERE vacancy_id = ?',
+                (now, now, vacancy_id)
+            )
+
+    def close(self) -> None:
+        """Закрытие соединения с файлом кэша (если кэш использовался) с записью отложенных обращений"""
+        if self._conn is None:
+            return
+        with self._lock, self._conn:
+            self._evict()
+        self._conn.close()
+        self._conn = None
@@ -0,0 +1,217 @@
+"""
+Модель зарплаты по навыкам и опыту для заполнения пропущенных зарплат
+
+Модель обучается на вакансиях с указанной зарплатой и сохраняется вместе с хэшем
+обучающих данных; пока данные не изменились, повторного обучения не происходит.
+Пропуски заполняются одним пакетным вызовом predict.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3 as sql
+from time import perf_counter
+from typing import Callable, List
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeRegressor
+
+from columnar import EXPERIENCE_LEVELS
+from currency import parse_salary_text
+from db import DB_FILE, REPO_ROOT
+from skill_matrix import META_COLUMNS
+
+# Сохраненные модели в корне репозитория
+MODEL_DIR = os.path.join(REPO_ROOT, 'models')
+
+# Колонки CSV парсера, используемые моделью
+EXPERIENCE_COLUMN = 'Опыт'
+REMOTE_COLUMN = 'Удаленная работа'
+TARGET_COLUMN = 'Зарплата RUB'
+IMPUTED_COLUMN = 'Зарплата предсказана'
+
+
+def default_estimator():
+    """Дерево решений с параметрами, подобранными в анализе бэкенд-вакансий"""
+    return DecisionTreeRegressor(random_state=10, criterion='absolute_error',
+                                 min_samples_leaf=6, min_samples_split=15)
+
+
+def read_vacancies_csv(csv_file: str) -> pd.DataFrame:
+    """
+    Загрузка CSV парсера с зарплатой в рублях
+    Для старых файлов без колонки 'Зарплата RUB' она вычисляется из колонки 'Зарплата'
+    :param csv_file: Путь к CSV файлу
+    :return: DataFrame вакансий
+    """
+    df = pd.read_csv(csv_file)
+    if TARGET_COLUMN not in df.columns:
+        df[TARGET_COLUMN] = [parse_salary_text(text if isinstance(text, str) else None)['salary_rub']
+                             for text in df.get('Зарплата', pd.Series([None] * len(df)))]
+    return df
+
+
+def read_vacancies_db(specialization: str, db_file: str = DB_FILE) -> pd.DataFrame:
+    """
+    Загрузка вакансий специальности из нормализованной схемы в формате CSV парсера
+    :param specialization: Специальность
+    :param db_file: Путь к файлу базы данных
+    :return: DataFrame вакансий (колонки опыта, удаленной работы, зарплаты и флаги навыков)
+    """
+    with sql.connect(db_file) as conn:
+        vacancies = pd.read_sql_query(
+            'SELECT v.id, v.url AS "Ссылка", v.experience AS "Опыт", v.remote, v.salary_rub AS "Зарплата RUB" '
+            'FROM vacancies v JOIN vacancy_specialization vs ON vs.vacancy_id = v.id WHERE vs.specialization = ?',
+            conn, params=(specialization,), index_col='id'
+        )
+        links = pd.read_sql_query(
+            'SELECT vs.vacancy_id, s.name FROM vacancy_skill vs JOIN skills s ON s.id = vs.skill_id '
+            'WHERE vs.specialization = ?', conn, params=(specialization,)
+        )
+
+    vacancies[REMOTE_COLUMN] = np.where(vacancies.pop('remote') == 1, 'Да', 'Нет')
+    skills = pd.crosstab(links['vacancy_id'], links['name']).clip(upper=1)
+    return vacancies.join(skills).fillna({name: 0 for name in skills.columns})
+
+
+def skill_columns(df: pd.DataFrame) -> List[str]:
+    """Колонки навыков DataFrame (все, кроме служебных колонок парсера)"""
+    return [col for col in df.columns if col not in META_COLUMNS and col != IMPUTED_COLUMN]
+
+
+def build_features(df: pd.DataFrame, skills: List[str]) -> np.ndarray:
+    """
+    Матрица признаков: флаги навыков, уровень опыта и удаленная работа
+    :param df: DataFrame вакансий
+    :param skills: Колонки навыков (порядок признаков модели)
+    :return: Матрица float32 вакансии x признаки
+    """
+    flags = df.reindex(columns=skills, fill_value=0).to_numpy(dtype=np.float32, na_value=0)
+    levels = {level: i for i, level in enumerate(EXPERIENCE_LEVELS)}
+    experience = df[EXPERIENCE_COLUMN].map(levels).fillna(-1).to_numpy(dtype=np.float32)
+    remote = (df[REMOTE_COLUMN] == 'Да').to_numpy(dtype=np.float32)
+    return np.column_stack([flags, experience, remote])
+
+
+def data_fingerprint(X: np.ndarray, y: np.ndarray, skills: List[str], estimator) -> str:
+    """Хэш обучающих данных, признаков и параметров модели"""
+    digest = hashlib.sha1()
+    digest.update('\x1f'.join(skills).encode('utf-8'))
+    digest.update(repr(sorted(estimator.get_params().items())).encode('utf-8'))
+    digest.update(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class SalaryModel:
+    """Модель зарплаты с сохранением на диск и повторным использованием до изменения данных"""
+
+    def __init__(self, name: str, model_dir: str = MODEL_DIR,
+                 estimator_factory: Callable = default_estimator):
+        """
+        Инициализация модели
+        :param name: Имя модели (например, специальность); файл models/salary_<name>.joblib
+        :param model_dir: Каталог сохраненных моделей
+        :param estimator_factory: Функция, создающая необученную модель sklearn
+        """
+        self.path = os.path.join(model_dir, f'salary_{name}.joblib')
+        self.estimator_factory = estimator_factory
+        self.estimator = None
+        self.skills = []
+        self.fingerprint = None
+
+    def fit(self, df: pd.DataFrame) -> bool:
+        """
+        Обучение на вакансиях с известной зарплатой либо загрузка сохраненной модели
+        :param df: DataFrame вакансий
+        :return: True, если модель была обучена заново
+        """
+        known = df[df[TARGET_COLUMN].notna()]
+        if known.empty:
+            raise ValueError("Нет вакансий с указанной зарплатой для обучения")
+
+        skills = skill_columns(df)
+        X = build_features(known, skills)
+        y = known[TARGET_COLUMN].to_numpy(dtype=np.float64)
+        estimator = self.estimator_factory()
+        fingerprint = data_fingerprint(X, y, skills, estimator)
+
+        if os.path.exists(self.path):
+            saved = joblib.load(self.path)
+            if saved['fingerprint'] == fingerprint:
+                self.estimator, self.skills, self.fingerprint = saved['estimator'], saved['skills'], fingerprint
+                return False
+
+        estimator.fit(X, y)
+        self.estimator, self.skills, self.fingerprint = estimator, skills, fingerprint
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        joblib.dump({'estimator': estimator, 'skills': skills, 'fingerprint': fingerprint}, self.path)
+        return True
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """Предсказание зарплаты для всех строк одним вызовом"""
+        if self.estimator is None:
+            raise ValueError("Модель не обучена: сначала вызовите fit")
+        return self.estimator.predict(build_features(df, self.skills))
+
+    def impute(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Заполнение пропущенных зарплат
+        :param df: DataFrame вакансий
+        :return: Копия df с заполненной колонкой 'Зарплата RUB' и флагом 'Зарплата предсказана'
+        """
+        result = df.copy()
+        missing = result[TARGET_COLUMN].isna().to_numpy()
+        result[IMPUTED_COLUMN] = missing
+        if missing.any():
+            result.loc[missing, TARGET_COLUMN] = self.predict(result[missing])
+        return result
+
+
+def impute_salaries(df: pd.DataFrame, name: str, model_dir: str = MODEL_DIR) -> pd.DataFrame:
+    """
+    Обучение (или загрузка) модели и заполнение пропущенных зарплат
+    :param df: DataFrame вакансий
+    :param name: Имя модели (например, специальность)
+    :param model_dir: Каталог сохраненных моделей
+    :return: DataFrame с заполненными зарплатами
+    """
+    model = SalaryModel(name, model_dir)
+    start = perf_counter()
+    trained = model.fit(df)
+    fit_time = perf_counter() - start
+
+    start = perf_counter()
+    result = model.impute(df)
+    impute_time = perf_counter() - start
+    print(f"Модель {'обучена' if trained else 'загружена'} за {fit_time * 1000:.1f} мс, "
+          f"заполнено зарплат: {int(result[IMPUTED_COLUMN].sum())} за {impute_time * 1000:.1f} мс")
+    return result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Заполнение пропущенных зарплат моделью по навыкам')
+    arg_parser.add_argument('--csv', help='CSV файл парсера (иначе вакансии берутся из базы данных)')
+    arg_parser.add_argument('--specialization', help='специальность в базе данных и имя модели')
+    arg_parser.add_argument('--db', default=DB_FILE, help='файл базы данных')
+    arg_parser.add_argument('--output', help='сохранить результат в CSV файл')
+    args = arg_parser.parse_args()
+
+    if not args.csv and not args.specialization:
+        arg_parser.error('укажите --csv или --specialization')
+
+    if args.csv:
+        df = read_vacancies_csv(args.csv)
+    else:
+        df = read_vacancies_db(args.specialization, args.db)
+    name = args.specialization or os.path.splitext(os.path.basename(args.csv))[0]
+
+    result = impute_salaries(df, name)
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"Результат сохранен в {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, NamedTuple
+
+from hh_client import FetchRegistry
+from parser_class import VacancyParser
+from rate_limiter import TokenBucket
+
+
+class CrawlJob(NamedTuple):
+    """Задание на парсинг: поисковый запрос, специальность и регион"""
+    query: str
+    specialization: str
+    area: int = 1
+
+
+def run_jobs(jobs: List[CrawlJob], rate_limit: float = 2.0, workers: int = 4,
+             save: bool = True) -> Dict[CrawlJob, VacancyParser]:
+    """
+    Одновременный парсинг нескольких заданий под общим лимитом запросов
+    Вакансия, найденная в нескольких заданиях, загружается с сервера один раз
+    :param jobs: Список заданий
+    :param rate_limit: Общий лимит запросов в секунду на все задания
+    :param workers: Количество одновременных запросов деталей в одном задании
+    :param save: Сохранить результат каждого задания в CSV
+    :return: Словарь задание -> парсер с данными
+    """
+    start_time = datetime.now()
+    rate_limiter = TokenBucket(rate_limit, capacity=max(1, workers))
+    registry = FetchRegistry()
+    parsers = {
+        # Общий ограничитель: все запросы заданий идут через общий лимит при любом workers
+        job: VacancyParser(job.query, job.specialization, job.area, workers=workers,
+                           rate_limiter=rate_limiter, fetch_registry=registry)
+        for job in jobs
+    }
+
+    def run(job_id: int, job: CrawlJob) -> None:
+        parser = parsers[job]
+        # Номер задания в имени файла: задания одной специальности и региона различаются запросом
+        if parser.parse_vacancies() and save:
+            parser.save_to_csv(f"{parser.specialization}_{job.area}_{job_id}_vacancies.csv")
+
+    with ThreadPoolExecutor(max_workers=len(jobs) or 1) as executor:
+        list(executor.map(run, range(len(jobs)), jobs))
+
+    total = sum(len(parser.vacancies_data) for parser in parsers.values())
+    print(f"\nЗаданий: {len(jobs)}, вакансий: {total}, повторов между заданиями: {registry.duplicates}")
+    print(f"Общее время выполнения: {datetime.now() - start_time}")
+    return parsers
+
+
+if __name__ == '__main__':
+    search_query = input('Введите название вакансии: ')
+    areas = input('Введите ID регионов через запятую (1 - Москва): ') or '1'
+    run_jobs([
+        CrawlJob(search_query, specialization, int(area))
+        for specialization in VacancyParser.SPECIALIZATION_KEYWORDS
+        for area in areas.split(',')
+    ])
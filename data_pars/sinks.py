@@ -0,0 +1,156 @@
+import csv
+from typing import List
+
+from metrics import METRICS
+
+
+class BatchSink:
+    """Базовый приемник строк вакансий с записью фиксированными пачками"""
+
+    def __init__(self, batch_size: int = 100):
+        """
+        Инициализация приемника
+        :param batch_size: Количество строк, после которого буфер сбрасывается
+        """
+        self.batch_size = batch_size
+        self.headers = []
+        self.buffer = []
+        self.written = 0
+
+    def __enter__(self):
+        """Поддержка контекстного менеджера"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Поддержка контекстного менеджера"""
+        self.close()
+
+    def open(self, headers: List[str]) -> None:
+        """Подготовка приемника к записи строк с указанными колонками"""
+        self.headers = headers
+
+    def write(self, row: List) -> None:
+        """Добавление строки в буфер"""
+        self.buffer.append(row)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Запись накопленных строк"""
+        if self.buffer:
+            with METRICS.timer(f'sink_{type(self).__name__}'):
+                self.write_batch(self.buffer)
+            self.written += len(self.buffer)
+            self.buffer = []
+
+    def write_batch(self, rows: List[List]) -> None:
+        """Запись пачки строк в хранилище"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Сброс остатка буфера"""
+        self.flush()
+
+
+class CSVSink(BatchSink):
+    """Потоковая запись вакансий в CSV-файл"""
+
+    def __init__(self, filename: str, batch_size: int = 100):
+        """
+        Инициализация приемника
+        :param filename: Путь к CSV файлу
+        :param batch_size: Количество строк, после которого буфер сбрасывается
+        """
+        super().__init__(batch_size)
+        self.filename = filename
+        self.file = None
+        self.writer = None
+
+    def open(self, headers: List[str]) -> None:
+        """Создание файла и запись заголовков"""
+        super().open(headers)
+        self.file = open(self.filename, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+
+    def write_batch(self, rows: List[List]) -> None:
+        """Запись пачки строк в файл"""
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self) -> None:
+        """Сброс остатка буфера и закрытие файла"""
+        if self.file:
+            super().close()
+            self.file.close()
+            self.file = None
+            print(f"Отчет сохранен в {self.filename}")
+
+
+class SQLiteSink(BatchSink):
+    """Потоковая запись вакансий в SQLite через CSVtoSQLiteImporter"""
+
+    def __init__(self, importer, table_name: str, batch_size: int = 100, upsert: bool = False):
+        """
+        Инициализация приемника
+        :param importer: Экземпляр CSVtoSQLiteImporter
+        :param table_name: Имя таблицы
+        :param batch_size: Количество строк, после которого буфер сбрасывается
+        :param upsert: Обновлять уже записанные вакансии по ссылке вместо добавления дубликатов
+        """
+        super().__init__(batch_size)
+        self.importer = importer
+        self.table_name = table_name
+        self.upsert = upsert
+
+    def open(self, headers: List[str]) -> None:
+        """Подключение к базе данных и создание таблицы"""
+        super().open(headers)
+        if not self.importer.conn:
+            self.importer.connect()
+        self.importer.create_table(self.table_name, headers)
+        if self.upsert:
+            self.importer.create_unique_index(self.table_name, self.importer.key_column(headers))
+
+    def write_batch(self, rows: List[List]) -> None:
+        """Вставка пачки строк одной транзакцией"""
+        self.importer.insert_rows(self.table_name, self.headers, rows, upsert=self.upsert)
+
+    def close(self) -> None:
+        """Сброс остатка буфера"""
+        super().close()
+        print(f"Записано {self.written} строк в таблицу {self.table_name}")
+
+
+class NormalizedSQLiteSink(BatchSink):
+    """Потоковая запись вакансий в нормализованную схему SQLite (vacancies, skills, vacancy_skill)"""
+
+    def __init__(self, importer, specialization: str, batch_size: int = 500):
+        """
+        Инициализация приемника
+        :param importer: Экземпляр CSVtoSQLiteImporter
+        :param specialization: Специальность, к которой относятся вакансии
+        :param batch_size: Количество строк, после которого буфер сбрасывается
+        """
+        super().__init__(batch_size)
+        self.importer = importer
+        self.specialization = specialization
+        self.unchanged = 0
+
+    def open(self, headers: List[str]) -> None:
+        """Подключение к базе данных и создание схемы"""
+        super().open(headers)
+        if not self.importer.conn:
+            self.importer.connect()
+        self.importer.create_normalized_schema()
+
+    def write_batch(self, rows: List[List]) -> None:
+        """Запись пачки строк; значения приводятся к строкам, как при чтении CSV"""
+        rows = [['' if value is None else str(value) for value in row] for row in rows]
+        unchanged = self.importer.insert_normalized(self.headers, rows, self.specialization)[1]
+        self.unchanged += unchanged
+
+    def close(self) -> None:
+        """Сброс остатка буфера"""
+        super().close()
+        print(f"Записано {self.written} вакансий ({self.specialization}), без изменений: {self.unchanged}")
@@ -0,0 +1,228 @@
+"""
+Сопоставление навыков учебных программ вузов со спросом на рынке вакансий
+
+Обе стороны приводятся к общему словарю навыков, после чего покрытие спроса,
+сходство (Jaccard или косинусное) и лучшие вакансии для каждого вуза считаются
+матричными операциями по блокам вакансий. Результаты кэшируются по хэшу данных.
+"""
+import argparse
+import csv
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from db import REPO_ROOT
+from fingerprint import file_hash
+from skill_matrix import convert_csv, load_skill_matrix, matrix_paths, unpack
+
+# Кэш результатов в корне репозитория
+CACHE_DIR = os.path.join(REPO_ROOT, 'skill_match_cache')
+
+# Ограничение размера блока сходства вузы x вакансии (элементов float32)
+BLOCK_ELEMENTS = 1 << 24
+
+METRICS = ('jaccard', 'cosine')
+
+
+class MatchResult(NamedTuple):
+    """Результат сопоставления вузов с вакансиями"""
+    universities: List[str]
+    vocabulary: List[str]
+    demand: np.ndarray          # доля вакансий с навыком, по словарю
+    coverage: np.ndarray        # покрытие спроса, взвешенное по доле вакансий (0..1)
+    mean_similarity: np.ndarray  # среднее сходство вуза с вакансиями
+    top_vacancies: List[List[str]]  # лучшие вакансии для каждого вуза
+    top_scores: np.ndarray      # сходство лучших вакансий (вузы x top_k)
+
+
+def load_universities(csv_file: str) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Загрузка таблицы вузов: первая колонка - название, остальные - флаги навыков 0/1
+    :param csv_file: Путь к CSV файлу (UTF-8 или cp1251)
+    :return: Названия вузов, навыки, матрица uint8 вузы x навыки
+    """
+    for encoding in ('utf-8-sig', 'cp1251'):
+        try:
+            with open(csv_file, encoding=encoding) as f:
+                rows = list(csv.reader(f))
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"Не удалось определить кодировку файла {csv_file}")
+
+    headers, rows = rows[0], [row for row in rows[1:] if row]
+    names = [row[0] for row in rows]
+    matrix = np.array([[value.strip() == '1' for value in row[1:len(headers)]] for row in rows], dtype=np.uint8)
+    return names, [skill.strip().upper() for skill in headers[1:]], matrix.reshape(len(rows), len(headers) - 1)
+
+
+def load_vacancies(csv_file: str) -> Tuple[str, np.ndarray, List[str], List[str]]:
+    """
+    Загрузка упакованной матрицы навыков вакансий (создается из CSV, если устарела)
+    :param csv_file: CSV файл парсера
+    :return: Путь к матрице без расширения, упакованная матрица, навыки, вакансии
+    """
+    basename = os.path.splitext(csv_file)[0]
+    matrix_file = matrix_paths(basename)['matrix']
+    if not os.path.exists(matrix_file) or os.path.getmtime(matrix_file) < os.path.getmtime(csv_file):
+        convert_csv(csv_file)
+    packed, skills, vacancies = load_skill_matrix(basename)
+    return basename, packed, [skill.upper() for skill in skills], vacancies
+
+
+def align(matrix: np.ndarray, skills: List[str], vocabulary: List[str]) -> np.ndarray:
+    """
+    Перестановка колонок матрицы под общий словарь навыков (отсутствующие навыки - нули)
+    :param matrix: Матрица 0/1 строки x skills
+    :param skills: Навыки колонок matrix
+    :param vocabulary: Общий словарь навыков
+    :return: Матрица float32 строки x vocabulary
+    """
+    index = {skill: i for i, skill in enumerate(skills)}
+    result = np.zeros((matrix.shape[0], len(vocabulary)), dtype=np.float32)
+    columns = [(j, index[skill]) for j, skill in enumerate(vocabulary) if skill in index]
+    if columns:
+        target, source = zip(*columns)
+        result[:, list(target)] = matrix[:, list(source)]
+    return result
+
+
+def similarity(universities: np.ndarray, vacancies: np.ndarray, metric: str = 'jaccard') -> np.ndarray:
+    """
+    Матрица сходства вузы x вакансии
+    :param universities: Матрица float32 вузы x словарь
+    :param vacancies: Матрица float32 вакансии x словарь
+    :param metric: 'jaccard' или 'cosine'
+    :return: Матрица float32 вузы x вакансии (0 для пустых наборов навыков)
+    """
+    intersection = universities @ vacancies.T
+    u_sizes = universities.sum(axis=1)[:, None]
+    v_sizes = vacancies.sum(axis=1)[None, :]
+    if metric == 'jaccard':
+        denominator = u_sizes + v_sizes - intersection
+    elif metric == 'cosine':
+        denominator = np.sqrt(u_sizes * v_sizes)
+    else:
+        raise ValueError(f"Неизвестная метрика {metric}. Допустимые значения: {', '.join(METRICS)}")
+    return np.divide(intersection, denominator, out=np.zeros_like(intersection), where=denominator > 0)
+
+
+def compute_match(universities: np.ndarray, packed: np.ndarray, vacancy_skills: List[str],
+                  vocabulary: List[str], metric: str = 'jaccard',
+                  top_k: int = 10) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Покрытие спроса, среднее сходство и лучшие вакансии по блокам упакованной матрицы
+    :param universities: Матрица float32 вузы x словарь
+    :param packed: Упакованная матрица вакансий (skill_matrix.build_matrix)
+    :param vacancy_skills: Навыки колонок packed
+    :param vocabulary: Общий словарь навыков
+    :param metric: 'jaccard' или 'cosine'
+    :param top_k: Количество лучших вакансий для каждого вуза
+    :return: demand, coverage, mean_similarity, индексы и сходство лучших вакансий
+    """
+    n_universities, n_vacancies = universities.shape[0], packed.shape[0]
+    top_k = min(top_k, n_vacancies)
+    block_rows = max(1, BLOCK_ELEMENTS // max(1, n_universities))
+
+    counts = np.zeros(len(vocabulary), dtype=np.float64)
+    similarity_sum = np.zeros(n_universities, dtype=np.float64)
+    best_scores = np.full((n_universities, top_k), -1.0, dtype=np.float32)
+    best_index = np.zeros((n_universities, top_k), dtype=np.int64)
+
+    for start in range(0, n_vacancies, block_rows):
+        block = align(unpack(packed[start:start + block_rows], len(vacancy_skills)), vacancy_skills, vocabulary)
+        counts += block.sum(axis=0, dtype=np.float64)
+        scores = similarity(universities, block, metric)
+        similarity_sum += scores.sum(axis=1, dtype=np.float64)
+
+        # Слияние лучших вакансий блока с накопленными
+        scores = np.concatenate([best_scores, scores], axis=1)
+        index = np.concatenate([best_index, np.arange(start, start + block.shape[0])[None, :].repeat(n_universities, 0)],
+                               axis=1)
+        keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k] if top_k else np.zeros((n_universities, 0), int)
+        best_scores = np.take_along_axis(scores, keep, axis=1)
+        best_index = np.take_along_axis(index, keep, axis=1)
+
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_index = np.take_along_axis(best_index, order, axis=1)
+
+    demand = counts / n_vacancies if n_vacancies else counts
+    total_demand = demand.sum()
+    coverage = (universities @ demand) / total_demand if total_demand else np.zeros(n_universities)
+    mean_similarity = similarity_sum / n_vacancies if n_vacancies else similarity_sum
+    return demand, coverage, mean_similarity, best_index, best_scores
+
+
+def match(universities_csv: str, vacancies_csv: str, metric: str = 'jaccard', top_k: int = 10,
+          cache_dir: Optional[str] = CACHE_DIR) -> MatchResult:
+    """
+    Сопоставление вузов с вакансиями с кэшированием по снимку данных
+    :param universities_csv: CSV файл вузов (название, флаги навыков)
+    :param vacancies_csv: CSV файл вакансий парсера
+    :param metric: 'jaccard' или 'cosine'
+    :param top_k: Количество лучших вакансий для каждого вуза
+    :param cache_dir: Каталог кэша (None - без кэша)
+    :return: Результат сопоставления
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Неизвестная метрика {metric}. Допустимые значения: {', '.join(METRICS)}")
+
+    names, university_skills, university_matrix = load_universities(universities_csv)
+    basename, packed, vacancy_skills, vacancies = load_vacancies(vacancies_csv)
+    vocabulary = sorted(set(university_skills) | set(vacancy_skills))
+
+    cache_file = None
+    if cache_dir:
+        paths = matrix_paths(basename)
+        snapshot = file_hash(universities_csv, paths['matrix'], paths['skills'], paths['vacancies'])
+        cache_file = os.path.join(cache_dir, f'{snapshot}_{metric}_{top_k}.npz')
+        if os.path.exists(cache_file):
+            cached = np.load(cache_file)
+            return MatchResult(
+                names, vocabulary, cached['demand'], cached['coverage'], cached['mean_similarity'],
+                [[vacancies[i] for i in row] for row in cached['top_index']], cached['top_scores']
+            )
+
+    universities = align(university_matrix, university_skills, vocabulary)
+    demand, coverage, mean_similarity, top_index, top_scores = compute_match(
+        universities, packed, vacancy_skills, vocabulary, metric, top_k
+    )
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(cache_file, demand=demand, coverage=coverage, mean_similarity=mean_similarity,
+                 top_index=top_index, top_scores=top_scores)
+
+    return MatchResult(names, vocabulary, demand, coverage, mean_similarity,
+                       [[vacancies[i] for i in row] for row in top_index], top_scores)
+
+
+def print_report(result: MatchResult, show_top: int = 3) -> None:
+    """Вывод рейтинга вузов по покрытию спроса"""
+    order = np.argsort(-result.coverage, kind='stable')
+    for i in order:
+        print(f"{result.universities[i]}: покрытие спроса {result.coverage[i]:.1%}, "
+              f"среднее сходство {result.mean_similarity[i]:.3f}")
+        for url, score in list(zip(result.top_vacancies[i], result.top_scores[i]))[:show_top]:
+            print(f"    {score:.2f} {url}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Сопоставление навыков вузов и вакансий')
+    arg_parser.add_argument('universities', help='CSV файл вузов')
+    arg_parser.add_argument('vacancies', help='CSV файл вакансий парсера')
+    arg_parser.add_argument('--metric', choices=METRICS, default='jaccard')
+    arg_parser.add_argument('--top-k', type=int, default=10, help='лучших вакансий на вуз')
+    arg_parser.add_argument('--no-cache', action='store_true', help='не использовать кэш результатов')
+    args = arg_parser.parse_args()
+
+    result = match(args.universities, args.vacancies, args.metric, args.top_k,
+                   None if args.no_cache else CACHE_DIR)
+    print_report(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import re
+from typing import Dict, List
+
+
+class SkillMatcher:
+    """Поиск технологий в тексте за один проход скомпилированным регулярным выражением"""
+
+    def __init__(self, tech_keywords: Dict[str, List[str]]):
+        """
+        Построение матчера по словарю технологий
+        :param tech_keywords: Словарь технология -> список синонимов
+        """
+        self.tech_keywords = tech_keywords
+        self._techs_by_keyword = {}
+        for tech, keywords in tech_keywords.items():
+            for keyword in keywords:
+                self._techs_by_keyword.setdefault(keyword.lower(), []).append(tech)
+
+        # Синонимы собираются в префиксное дерево, чтобы в каждой позиции текста
+        # проверка шла по общим префиксам, а не по всем синонимам подряд.
+        # Поиск внутри lookahead находит пересекающиеся вхождения ("js" в "node.js")
+        self._pattern = re.compile(
+            rf'(?=\b({self._trie_pattern(self._techs_by_keyword)})\b)', flags=re.IGNORECASE
+        )
+
+        # В одной позиции находится только одно совпадение, поэтому синонимы, связанные
+        # отношением префикса с синонимом другой технологии, проверяются отдельно
+        self._shadowed = []
+        for keyword, techs in self._techs_by_keyword.items():
+            if any(other != keyword and (other.startswith(keyword) or keyword.startswith(other))
+                   and set(other_techs) != set(techs)
+                   for other, other_techs in self._techs_by_keyword.items()):
+                self._shadowed.append((self._keyword_pattern(keyword), techs))
+
+    @staticmethod
+    def _keyword_pattern(keyword: str) -> re.Pattern:
+        """Регулярное выражение для поиска одного синонима целым словом"""
+        return re.compile(rf'\b{re.escape(keyword)}\b', flags=re.IGNORECASE)
+
+    @staticmethod
+    def _trie_pattern(keywords) -> str:
+        """Построение регулярного выражения по префиксному дереву синонимов"""
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            optional = '' in node
+            if len(branches) == 1 and not optional:
+                return branches[0]
+            # Более длинные продолжения пробуются раньше, пустое - последним
+            return f"(?:{'|'.join(branches)}){'?' if optional else ''}"
+
+        return build(trie)
+
+    def _techs_for(self, matched: str) -> List[str]:
+        """Технологии для найденного синонима"""
+        techs = self._techs_by_keyword.get(matched)
+        if techs is not None:
+            return techs
+        # Совпадение без учета регистра, отличающееся от синонима после lower()
+        for keyword, techs in self._techs_by_keyword.items():
+            if self._keyword_pattern(keyword).fullmatch(matched):
+                return techs
+        return []
+
+    def extract(self, text: str) -> List[str]:
+        """Извлечение технологий из текста с учетом синонимов"""
+        if not text:
+            return []
+
+        text = text.lower()
+        found_skills = set()
+        for match in self._pattern.finditer(text):
+            found_skills.update(self._techs_for(match.group(1)))
+
+        for pattern, techs in self._shadowed:
+            if not found_skills.issuperset(techs) and pattern.search(text):
+                found_skills.update(techs)
+        return list(found_skills)
@@ -0,0 +1,140 @@
+import csv
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Служебные колонки CSV VacancyParser (в порядке get_headers), за ними идут флаги навыков
+PARSER_META_COLUMNS = [
+    'Должность', 'Ссылка', 'Компания', 'Зарплата', 'Опыт', 'Удаленная работа',
+    'Зарплата от', 'Зарплата до', 'Валюта', 'До вычета налогов', 'Зарплата RUB',
+    'Хэш содержимого',
+]
+
+# Колонки CSV парсеров, которые не являются флагами навыков
+META_COLUMNS = {*PARSER_META_COLUMNS, 'URL', 'Name', 'Area'}
+
+# Количество строк, распаковываемых за раз при подсчетах
+CHUNK_ROWS = 65536
+
+
+def matrix_paths(basename: str) -> Dict[str, str]:
+    """Пути к файлам матрицы навыков и индексов"""
+    return {
+        'matrix': f'{basename}.skills.npy',
+        'skills': f'{basename}.skills.txt',
+        'vacancies': f'{basename}.vacancies.txt',
+    }
+
+
+def build_matrix(records: Iterable[Iterable[str]], skills: List[str]) -> np.ndarray:
+    """
+    Построение упакованной матрицы вакансия x навык
+    :param records: Навыки каждой вакансии
+    :param skills: Список навыков (порядок колонок)
+    :return: Матрица uint8, в каждом байте 8 навыков (np.packbits по строкам)
+    """
+    index = {skill: i for i, skill in enumerate(skills)}
+    return build_id_matrix(([index[skill] for skill in vacancy_skills if skill in index] for vacancy_skills in records),
+                           len(skills))
+
+
+def build_id_matrix(records: Iterable[Iterable[int]], n_skills: int) -> np.ndarray:
+    """
+    Построение упакованной матрицы по номерам колонок навыков каждой вакансии
+    Выставляются только биты имеющихся навыков, без промежуточной плотной матрицы
+    :param records: Номера колонок навыков каждой вакансии (например, id SkillRegistry)
+    :param n_skills: Количество колонок навыков
+    :return: Матрица uint8 в формате build_matrix
+    """
+    rows, columns = [], []
+    n_rows = 0
+    for n_rows, vacancy_columns in enumerate(records, 1):
+        for column in vacancy_columns:
+            rows.append(n_rows - 1)
+            columns.append(column)
+
+    packed = np.zeros((n_rows, (n_skills + 7) // 8), dtype=np.uint8)
+    rows, columns = np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)
+    np.bitwise_or.at(packed, (rows, columns >> 3), (0x80 >> (columns & 7)).astype(np.uint8))
+    return packed
+
+
+def save_skill_matrix(basename: str, packed: np.ndarray, skills: List[str], vacancies: List[str]) -> None:
+    """
+    Сохранение матрицы навыков и индексов рядом с CSV
+    :param basename: Путь к файлам без расширения
+    :param packed: Упакованная матрица из build_matrix
+    :param skills: Названия навыков (колонки)
+    :param vacancies: Идентификаторы вакансий (строки), например ссылки
+    """
+    paths = matrix_paths(basename)
+    np.save(paths['matrix'], packed)
+    for key, values in (('skills', skills), ('vacancies', vacancies)):
+        with open(paths[key], 'w', encoding='utf-8') as f:
+            f.writelines(f'{value}\n' for value in values)
+
+
+def load_skill_matrix(basename: str) -> Tuple[np.ndarray, List[str], List[str]]:
+    """
+    Загрузка матрицы навыков без чтения файла в память (memory-mapped)
+    :param basename: Путь к файлам без расширения
+    :return: Упакованная матрица, список навыков, список вакансий
+    """
+    paths = matrix_paths(basename)
+    packed = np.load(paths['matrix'], mmap_mode='r')
+    indexes = []
+    for key in ('skills', 'vacancies'):
+        with open(paths[key], encoding='utf-8') as f:
+            indexes.append(f.read().splitlines())
+    return packed, indexes[0], indexes[1]
+
+
+def unpack(packed: np.ndarray, n_skills: int) -> np.ndarray:
+    """Распаковка матрицы в uint8 0/1 размера вакансии x навыки"""
+    return np.unpackbits(packed, axis=1, count=n_skills)
+
+
+def skill_counts(packed: np.ndarray, n_skills: int) -> np.ndarray:
+    """Количество вакансий с каждым навыком"""
+    counts = np.zeros(n_skills, dtype=np.int64)
+    for start in range(0, packed.shape[0], CHUNK_ROWS):
+        counts += unpack(packed[start:start + CHUNK_ROWS], n_skills).sum(axis=0, dtype=np.int64)
+    return counts
+
+
+def cooccurrence(packed: np.ndarray, n_skills: int) -> np.ndarray:
+    """Матрица совместной встречаемости навыков (навыки x навыки)"""
+    result = np.zeros((n_skills, n_skills), dtype=np.int64)
+    for start in range(0, packed.shape[0], CHUNK_ROWS):
+        chunk = unpack(packed[start:start + CHUNK_ROWS], n_skills).astype(np.int32)
+        result += chunk.T @ chunk
+    return result
+
+
+def convert_csv(csv_file: str) -> str:
+    """
+    Сохранение матрицы навыков для существующего CSV файла парсера
+    :param csv_file: Путь к CSV файлу
+    :return: Путь к файлам матрицы без расширения
+    """
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        headers = next(reader)
+        skill_columns = [i for i, col in enumerate(headers) if col not in META_COLUMNS]
+        url_column = headers.index('Ссылка') if 'Ссылка' in headers else headers.index('URL')
+
+        vacancies, rows = [], []
+        for row in reader:
+            vacancies.append(row[url_column])
+            rows.append([row[i] == '1' for i in skill_columns])
+
+    dense = np.array(rows, dtype=bool).reshape(len(rows), len(skill_columns))
+    basename = os.path.splitext(csv_file)[0]
+    save_skill_matrix(basename, np.packbits(dense, axis=1), [headers[i] for i in skill_columns], vacancies)
+    return basename
+
+
+if __name__ == '__main__':
+    csv_file = input('Введите путь к CSV файлу: ').strip()
+    print(f"Матрица навыков сохранена: {convert_csv(csv_file)}.skills.npy")
@@ -0,0 +1,101 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+# Синонимы ключевых навыков hh.ru: разные написания одного навыка
+# (категории поиска по тексту VacancyParser сюда не входят - это разные навыки одной группы)
+SKILL_SYNONYMS = {
+    'APACHE SPARK': ['spark', 'apache spark'],
+    'APACHE KAFKA': ['kafka', 'apache kafka'],
+    'APACHE AIRFLOW': ['airflow', 'apache airflow'],
+    'HADOOP': ['hadoop', 'apache hadoop'],
+    'POSTGRESQL': ['postgresql', 'postgres'],
+    'MS SQL': ['ms sql', 'mssql', 'ms sql server', 'microsoft sql server'],
+    'SCIKIT-LEARN': ['scikit-learn', 'scikit learn', 'sklearn'],
+    'MACHINE LEARNING': ['machine learning', 'машинное обучение', 'ml'],
+    'DEEP LEARNING': ['deep learning', 'глубокое обучение'],
+    'CI/CD': ['ci/cd', 'ci cd', 'cicd'],
+    'REST API': ['rest api', 'rest', 'restful api'],
+    'ООП': ['ооп', 'oop'],
+    'АНГЛИЙСКИЙ ЯЗЫК': ['английский язык', 'english'],
+    # Написания технологий VacancyParser
+    'KUBERNETES': ['k8s'],
+    'JAVASCRIPT': ['js'],
+    'GO': ['golang'],
+    'C_SHARP': ['c#'],
+    'NODEJS': ['node.js', 'node js'],
+    'REACT': ['react.js', 'reactjs'],
+    'VUE': ['vue.js', 'vuejs'],
+    'SECURITY': ['информационная безопасность', 'information security', 'кибербезопасность', 'cybersecurity'],
+}
+
+
+class SkillRegistry:
+    """Словарь навыков: канонические названия с целочисленными id и таблица синонимов"""
+
+    def __init__(self, canonical: Iterable[str] = (),
+                 synonyms: Optional[Dict[str, List[str]]] = SKILL_SYNONYMS):
+        """
+        Построение словаря; названия canonical получают id 0..n-1 в переданном порядке
+        Каноническое название важнее синонима другого навыка; среди синонимов остается первый
+        :param canonical: Канонические названия без синонимов (например, технологии VacancyParser.tech_keywords;
+            ключевые слова поиска по тексту синонимами не считаются)
+        :param synonyms: Таблица синонимов: каноническое название -> написания навыка
+        """
+        self.names = []
+        self._ids = {}
+        self._canonical = {}
+        for name in canonical:
+            self.add(name)
+        for name, aliases in (synonyms or {}).items():
+            self.add(name, aliases)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Нормализация названия для поиска: верхний регистр, одиночные пробелы"""
+        return ' '.join(name.split()).upper()
+
+    def add(self, canonical: str, synonyms: Iterable[str] = ()) -> int:
+        """
+        Добавление навыка и его синонимов
+        :param canonical: Каноническое название (название колонки)
+        :param synonyms: Синонимы навыка
+        :return: id навыка
+        """
+        key = self.normalize(canonical)
+        skill_id = self._canonical.get(key)
+        if skill_id is None:
+            skill_id = len(self.names)
+            self.names.append(canonical)
+            self._canonical[key] = self._ids[key] = skill_id
+        for synonym in synonyms:
+            self._ids.setdefault(self.normalize(synonym), skill_id)
+        return skill_id
+
+    def get(self, name: str) -> Optional[int]:
+        """id навыка по названию или синониму (None, если навык неизвестен)"""
+        return self._ids.get(self.normalize(name))
+
+    def intern(self, name: str) -> int:
+        """id навыка; неизвестное название добавляется как новый навык"""
+        skill_id = self.get(name)
+        return skill_id if skill_id is not None else self.add(self.normalize(name))
+
+    def ids(self, names: Iterable[str], intern: bool = False) -> Set[int]:
+        """
+        Множество id навыков
+        :param names: Названия или синонимы навыков
+        :param intern: Добавлять неизвестные навыки (иначе они пропускаются)
+        :return: Множество id
+        """
+        if intern:
+            return {self.intern(name) for name in names}
+        return {skill_id for skill_id in map(self.get, names) if skill_id is not None}
+
+    def name(self, skill_id: int) -> str:
+        """Каноническое название навыка"""
+        return self.names[skill_id]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
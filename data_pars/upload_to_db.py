@@ -1,19 +1,28 @@
 from db import CSVtoSQLiteImporter
-from db import DB_FILE, TABLE_NAME
+from db import DB_FILE
+import glob
 import sys
 
 
 
 def main():
     try:
-        data_file = input('Введите имя CSV файла (без расширения): ').strip()
+        data_file = input('Введите имя CSV файла (без расширения) или шаблон (../*/*_vacancies.csv): ').strip()
         if not data_file:
             print("Ошибка: Не указано имя файла")
             return
-        csv_file = f"{data_file}.csv"
+        # Шаблон загружает все подходящие файлы (в том числе .csv.gz/.csv.zst) одной транзакцией
+        csv_files = sorted(glob.glob(data_file)) if any(char in data_file for char in '*?[') else [f"{data_file}.csv"]
+        if not csv_files:
+            print(f"Ошибка: Нет файлов по шаблону {data_file}")
+            return
+        table_name = input('введите название таблицы(data_science, frontend, backend, cybersecurity):').strip()
+        # Обновление по ссылке требует колонки Ссылка/URL и таблицы без дубликатов
+        upsert = input('Обновлять уже загруженные вакансии по ссылке вместо добавления строк? (да/нет): ')
+        upsert = upsert.strip().lower() in ('да', 'д', 'y', 'yes')
 
         with CSVtoSQLiteImporter(DB_FILE) as importer:
-            imported_rows = importer.import_csv(csv_file, TABLE_NAME)
+            imported_rows = importer.import_many(csv_files, table_name, upsert=upsert)
             print(f"Успешно импортировано {imported_rows} записей")
 
 
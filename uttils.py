@@ -1,6 +1,8 @@
 import os
 import csv
 import sqlite3 as sql
+from itertools import islice
+from time import perf_counter
 
 
 def create_table(conn, table_name, columns):
@@ -14,29 +16,35 @@ def create_table(conn, table_name, columns):
             ''')
     conn.commit()
 
-def import_csv_to_sqlite(csv_file,db_file, table_name):
+def import_csv_to_sqlite(csv_file,db_file, table_name, chunk_size=5000):
     if not os.path.exists(csv_file):
         raise FileNotFoundError(f"{csv_file} not found")
-    with open(csv_file, 'r', encoding = 'utf-8') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
     conn = sql.connect(db_file)
     
     try:
-        create_table(conn, table_name, headers)
+        start_time = perf_counter()
         with open(csv_file, 'r', encoding = 'utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            headers = next(reader)
+            create_table(conn, table_name, headers)
             c = conn.cursor()
             placeholders = ', '.join(['?' for _ in headers])
             columns = ', '.join([f'"{col}"' for col in headers])
             sql_query = f'INSERT INTO {table_name} ({columns}) VALUES ({placeholders})'
             
-            for row in reader:
-                values = [row[col] for col in headers]
-                c.execute(sql_query, values)
-                print(values)
+            width = len(headers)
+            count = 0
+            while True:
+                chunk = list(islice(reader, chunk_size))
+                if not chunk:
+                    break
+                # Пустые строки пропускаются, строки с пропущенными или лишними значениями выравниваются по заголовку
+                chunk = [row if len(row) == width else (row + [None] * width)[:width] for row in chunk if row]
+                c.executemany(sql_query, chunk)
+                count += len(chunk)
             conn.commit()
-        print(f"{reader.line_num - 1}")
+        elapsed = perf_counter() - start_time
+        print(f"{count} rows, {count / elapsed if elapsed else 0:.0f} rows/sec")
 
     except Exception as e:
         conn.rollback()
@@ -45,9 +53,8 @@ def import_csv_to_sqlite(csv_file,db_file, table_name):
     finally:
         conn.close()
 
-data_file = input('file name: ')
-
 if __name__ == '__main__':
+    data_file = input('file name: ')
     CSV_FILE = f'data_pars/{data_file}.csv'
     DB_FILE = 'database.db'
     TABLE_NAME = 'imployees'